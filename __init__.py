@@ -4,6 +4,22 @@ from __future__ import absolute_import
 from .schema import SQLAlchemyToRestPlus
 from .convert import SQLAlchemyModelConverter
 from .exceptions import ModelConversionError
+from .cache import ConversionCache
+from .bulk import convert_all, register_nested_models
+from .artifact import build_artifact, load_models
+from .marshalling import get_marshaller
+from .loading import get_loader_options
+from .streaming import iter_json, streaming_response
+from .core import get_column_map, select_for_model, get_row_marshaller
+from .writes import bulk_insert, bulk_update
+from .instrumentation import instrumentation
+from .registry import ModelRegistry, get_model
+from .interning import FieldInterner
+from .dependencies import ModelIndex
+from .validation import compile_validator, get_validator
+from .pagination import page_model, keyset_page
+from .swagger import SwaggerCache
+from .output_cache import MarshalCache, LocalBackend, SharedBackend
 
 __version__ = "0.17.0"
 __license__ = "MIT License"
@@ -11,5 +27,32 @@ __license__ = "MIT License"
 __all__ = [
     "SQLAlchemyToRestPlus",
     "SQLAlchemyModelConverter",
-    "ModelConversionError"",
+    "ModelConversionError",
+    "ConversionCache",
+    "convert_all",
+    "register_nested_models",
+    "build_artifact",
+    "load_models",
+    "get_marshaller",
+    "get_loader_options",
+    "iter_json",
+    "streaming_response",
+    "get_column_map",
+    "select_for_model",
+    "get_row_marshaller",
+    "instrumentation",
+    "ModelRegistry",
+    "get_model",
+    "FieldInterner",
+    "ModelIndex",
+    "compile_validator",
+    "get_validator",
+    "bulk_insert",
+    "bulk_update",
+    "page_model",
+    "keyset_page",
+    "SwaggerCache",
+    "MarshalCache",
+    "LocalBackend",
+    "SharedBackend",
 ]
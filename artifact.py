@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import importlib
+import json
+from collections import OrderedDict
+
+from flask_restplus import fields, Model
+from sqlalchemy.orm import class_mapper
+
+from .bulk import (
+    convert_all,
+    get_dependency_order,
+    get_mapped_classes,
+    link_nested_models,
+    register_models,
+    register_nested_models,
+)
+from .convert import SQLAlchemyModelConverter
+from .exceptions import ModelConversionError
+from .schema import SQLAlchemyToRestPlus, SortedSQLAlchemyToRestPlus
+
+# bump when the layout of the artifact changes
+ARTIFACT_FORMAT = 2
+
+
+def _qualified_name(obj) -> str:
+    return "{}:{}".format(obj.__module__, obj.__qualname__)
+
+
+def _import_field_class(path: str):
+    (module_name, qualname) = path.split(":")
+    obj = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    if not (isinstance(obj, type) and issubclass(obj, fields.Raw)):
+        raise ModelConversionError("{} is not a restplus field class.".format(path))
+    return obj
+
+
+def _encode_value(value):
+    '''
+    encodes a field kwarg value as json, field classes and models are stored by name
+    '''
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, type) and issubclass(value, fields.Raw):
+        return {"field": _qualified_name(value)}
+    if isinstance(value, Model):
+        return {"model": value.name}
+    raise ModelConversionError("Can not store field argument {!r} in an artifact.".format(value))
+
+
+def _decode_value(value):
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if "field" in value:
+            return _import_field_class(value["field"])
+        # placeholder, linked to the rebuilt model once all models exist
+        return Model(value["model"], {})
+    return value
+
+
+def metadata_hash(
+    classes,
+    model_converter=SQLAlchemyModelConverter,
+    include_relationships: bool = True,
+    nested_depth: int = 1,
+    version=None,
+) -> str:
+    '''
+    Returns a hash of the table and column names of classes, the class of each column type and
+    the conversion options. It is computed on every load_models, so column type arguments
+    (lengths, enums, ...) aren't part of it: pass a new version when they change.
+    :param classes: mapped classes
+    :param model_converter: the model converter class used for the conversion
+    :param include_relationships: include relationship properties
+    :param nested_depth: levels of relationships expanded into nested models
+    :param version: version of the metadata, e.g. the current migration
+    '''
+    values = [ARTIFACT_FORMAT, version, _qualified_name(model_converter), bool(include_relationships), nested_depth]
+    for class_ in classes:
+        mapper = class_mapper(class_)
+        values.append((_qualified_name(class_), getattr(mapper.local_table, "name", None)))
+        for prop in mapper.column_attrs:
+            column = prop.columns[0]
+            values.append((prop.key, getattr(column, "name", None), type(column.type).__name__,
+                           getattr(column, "nullable", None), getattr(column, "primary_key", None)))
+        if include_relationships:
+            for prop in mapper.relationships:
+                values.append((prop.key, prop.mapper.class_.__name__, prop.uselist))
+    return hashlib.sha256(repr(values).encode("utf-8")).hexdigest()
+
+
+def _recording_converter(model_converter, specs: dict):
+    '''
+    returns a subclass of model_converter that records the (field class, kwargs) spec of every
+    field it creates in specs, by field id. Being a new class it builds its own shared nested models.
+    '''
+    class RecordingConverter(model_converter):
+        interner = None
+
+        def sql_property2field(self, prop):
+            spec = self.sql_property2spec(prop)
+            if spec is None:
+                return None
+            (field_class, field_kwargs) = spec
+            field = field_class(**field_kwargs)
+            # the field is kept so its id isn't reused
+            specs[id(field)] = (field, spec)
+            return field
+
+    return RecordingConverter
+
+
+def _iter_models(models):
+    '''
+    yields models and the models nested in them, recursively, once each
+    '''
+    pending = list(models)
+    seen = set()
+    while pending:
+        model = pending.pop(0)
+        if id(model) in seen:
+            continue
+        seen.add(id(model))
+        yield model
+        for field in model.values():
+            nested_field = field if isinstance(field, fields.Nested) else getattr(field, "container", None)
+            if isinstance(nested_field, fields.Nested):
+                pending.append(nested_field.model)
+
+
+def build_artifact(
+    source,
+    path: str,
+    model_converter=SQLAlchemyModelConverter,
+    include_relationships: bool = True,
+    nested_depth: int = 1,
+    version=None,
+) -> dict:
+    '''
+    Converts every mapped class of source like convert_all and writes the generated field specs
+    of the models and their shared nested models to path, to be loaded with load_models at startup.
+    Run it at build time.
+    :param source: declarative Base, registry, or list of mappers or mapped classes
+    :param path: file to write the artifact to
+    :param model_converter: the model converter class to use (default SQLAlchemyModelConverter)
+    :param include_relationships: include relationship properties
+    :param nested_depth: levels of relationships expanded into nested models
+    :param version: version of the metadata stored in the artifact, see metadata_hash
+    :returns: the artifact
+    '''
+    classes = get_dependency_order(get_mapped_classes(source))
+    specs = {}
+    converted = convert_all(
+        classes,
+        model_converter=_recording_converter(model_converter, specs),
+        include_relationships=include_relationships,
+        nested_depth=nested_depth,
+    )
+    top_models = set(id(model) for model in converted.values())
+
+    models = []
+    for model in _iter_models(converted.values()):
+        model_fields = []
+        for (key, field) in model.items():
+            (field_class, field_kwargs) = specs[id(field)][1]
+            model_fields.append([
+                key,
+                _qualified_name(field_class),
+                {name: _encode_value(value) for (name, value) in field_kwargs.items()},
+            ])
+        models.append({
+            "class": _qualified_name(model.__sqla_model__),
+            "name": model.name,
+            "fields": model_fields,
+            "shared": id(model) not in top_models,
+        })
+
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": version,
+        "hash": metadata_hash(classes, model_converter, include_relationships, nested_depth, version),
+        "models": models,
+    }
+    with open(path, "w") as artifact_file:
+        json.dump(artifact, artifact_file, separators=(",", ":"))
+    return artifact
+
+
+def load_models(
+    source,
+    path: str,
+    api=None,
+    model_converter=SQLAlchemyModelConverter,
+    include_relationships: bool = True,
+    sorted: bool = True,
+    nested_depth: int = 1,
+    version=None,
+) -> OrderedDict:
+    '''
+    Rebuilds the models of source from an artifact written by build_artifact.
+    Falls back to convert_all when the artifact is missing, unreadable or was built
+    from different metadata or another version.
+    Takes the same arguments as convert_all plus the artifact path and version, and returns the same result.
+    The schemas of the models were checked when the artifact was built, they aren't checked again.
+    '''
+    classes = get_dependency_order(get_mapped_classes(source))
+    try:
+        with open(path) as artifact_file:
+            artifact = json.load(artifact_file)
+    except (OSError, ValueError):
+        artifact = None
+
+    if (
+        not isinstance(artifact, dict)
+        or artifact.get("format") != ARTIFACT_FORMAT
+        or artifact.get("version") != version
+        or artifact.get("hash") != metadata_hash(classes, model_converter, include_relationships, nested_depth, version)
+    ):
+        return convert_all(
+            classes,
+            api=api,
+            model_converter=model_converter,
+            include_relationships=include_relationships,
+            sorted=sorted,
+            nested_depth=nested_depth,
+        )
+
+    model_cls = SortedSQLAlchemyToRestPlus if sorted else SQLAlchemyToRestPlus
+    if not include_relationships:
+        nested_depth = None
+    options = {
+        "declared_fields": {},
+        "model_converter": model_converter,
+        "only": None,
+        "exclude": None,
+        "include_relationships": include_relationships,
+        "nested_depth": nested_depth,
+    }
+    classes_by_name = {_qualified_name(class_): class_ for class_ in classes}
+    field_classes = {}
+    models = OrderedDict()
+    shared_models = []
+    for entry in artifact["models"]:
+        model_fields = OrderedDict()
+        for (key, field_path, field_kwargs) in entry["fields"]:
+            field_class = field_classes.get(field_path)
+            if field_class is None:
+                field_class = field_classes[field_path] = _import_field_class(field_path)
+            model_fields[key] = field_class(**{
+                name: _decode_value(value) for (name, value) in field_kwargs.items()
+            })
+        class_ = classes_by_name[entry["class"]]
+        if entry["shared"]:
+            model = Model(entry["name"], model_fields)
+            model.__sqla_model__ = class_
+            shared_models.append(model)
+        else:
+            model = models[class_] = model_cls(entry["name"], model_fields, validation="off")
+            # the same attributes as models converted by SQLAlchemyToRestPlus
+            model.__sqla_model__ = class_
+            model.__sqla_options__ = dict(options)
+            model_index = getattr(model_cls, "model_index", None)
+            if model_index is not None:
+                model_index.track(model)
+
+    link_nested_models(list(models.values()) + shared_models)
+
+    if api is not None:
+        register_models(api, models.values())
+        for model in models.values():
+            register_nested_models(api, model)
+
+    return models
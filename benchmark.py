@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmarks for conversion, schema generation and marshalling, run against in-memory SQLite,
+and of the package import time in fresh interpreters.
+
+python -m flask_restplus_sqlalchemy.benchmark --output results.json
+python -m flask_restplus_sqlalchemy.benchmark --compare results.json
+
+Results are written as json so runs of different commits can be compared.
+'''
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import flask
+import flask_restplus
+import sqlalchemy as sa
+from flask_restplus.swagger import Swagger
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship, sessionmaker
+
+from . import __version__
+from .artifact import build_artifact, load_models
+from .bulk import convert_all
+from .convert import SQLAlchemyModelConverter
+from .core import get_row_marshaller, select_for_model
+from .loading import get_loader_options, get_mapped_class
+from .marshalling import get_marshaller
+from .schema import SQLAlchemyToRestPlus
+
+# column types used round robin for the synthetic classes
+COLUMN_TYPES = [
+    lambda: sa.Integer(),
+    lambda: sa.String(50),
+    lambda: sa.Float(),
+    lambda: sa.Boolean(),
+    lambda: sa.DateTime(),
+]
+
+COLUMN_VALUES = [
+    lambda row: row,
+    lambda row: "value {}".format(row),
+    lambda row: row / 3.0,
+    lambda row: bool(row % 2),
+    lambda row: dt.datetime(2020, 1, 1) + dt.timedelta(minutes=row),
+]
+
+
+# one column per type the converter maps, for the output checks
+TYPED_COLUMNS = [
+    (lambda: sa.Integer(), lambda row: row),
+    (lambda: sa.BigInteger(), lambda row: row * 1000000),
+    (lambda: sa.String(50), lambda row: "value {}".format(row)),
+    (lambda: sa.Text(), lambda row: "text {}".format(row)),
+    (lambda: sa.Unicode(50), lambda row: "unicode {}".format(row)),
+    (lambda: sa.Float(), lambda row: row / 3.0),
+    (lambda: sa.Boolean(), lambda row: bool(row % 2)),
+    (lambda: sa.DateTime(), lambda row: dt.datetime(2020, 1, 1) + dt.timedelta(minutes=row)),
+    (lambda: sa.Date(), lambda row: dt.date(2020, 1, 1) + dt.timedelta(days=row)),
+    (lambda: sa.Enum("a", "b", "c", name="letters"), lambda row: "abc"[row % 3]),
+    (lambda: sa.JSON(), lambda row: {"row": row, "values": [row, None]}),
+    (lambda: sa.LargeBinary(), lambda row: "bytes {}".format(row).encode()),
+]
+
+
+def _columns(count: int) -> dict:
+    return {
+        "column_{}".format(index): sa.Column(COLUMN_TYPES[index % len(COLUMN_TYPES)](), nullable=bool(index % 3))
+        for index in range(count)
+    }
+
+
+def _row_values(count: int, row: int) -> dict:
+    return {
+        "column_{}".format(index): COLUMN_VALUES[index % len(COLUMN_VALUES)](row)
+        for index in range(count)
+    }
+
+
+def _make_class(base, name: str, attributes: dict):
+    attributes = dict(attributes)
+    attributes.setdefault("__tablename__", name.lower())
+    attributes.setdefault("id", sa.Column(sa.Integer, primary_key=True))
+    return type(name, (base,), attributes)
+
+
+def build_flat(prefix: str, column_count: int):
+    '''
+    one class with column_count columns
+    '''
+    base = declarative_base()
+    root = _make_class(base, prefix, _columns(column_count))
+    return (base, root, column_count)
+
+
+def build_typed(prefix: str):
+    '''
+    one class with a column of each of TYPED_COLUMNS, nullable and filled on every other row
+    '''
+    base = declarative_base()
+    attributes = {
+        "column_{}".format(index): sa.Column(column_type(), nullable=True)
+        for (index, (column_type, value)) in enumerate(TYPED_COLUMNS)
+    }
+    root = _make_class(base, prefix, attributes)
+    return (base, root, 0)
+
+
+def _typed_row_values(row: int) -> dict:
+    if row % 2:
+        return {}
+    return {"column_{}".format(index): value(row) for (index, (column_type, value)) in enumerate(TYPED_COLUMNS)}
+
+
+def build_chain(prefix: str, length: int, column_count: int = 5):
+    '''
+    length classes, each with a many-to-one relationship to the next one
+    '''
+    base = declarative_base()
+    classes = []
+    for index in reversed(range(length)):
+        name = "{}{}".format(prefix, index)
+        attributes = _columns(column_count)
+        if classes:
+            target = classes[-1].__name__
+            attributes["next_id"] = sa.Column(sa.Integer, sa.ForeignKey(target.lower() + ".id"))
+            attributes["next"] = relationship(target)
+        classes.append(_make_class(base, name, attributes))
+    return (base, classes[-1], column_count)
+
+
+def build_cycle(prefix: str, length: int, column_count: int = 5):
+    '''
+    length classes in a ring, each with a relationship to the next one and its backref
+    '''
+    base = declarative_base()
+    names = ["{}{}".format(prefix, index) for index in range(length)]
+    classes = []
+    for (index, name) in enumerate(names):
+        target = names[(index + 1) % length]
+        attributes = _columns(column_count)
+        attributes["next_id"] = sa.Column(sa.Integer, sa.ForeignKey(target.lower() + ".id"))
+        attributes["next"] = relationship(
+            target, foreign_keys=[attributes["next_id"]], backref="previous", post_update=True
+        )
+        classes.append(_make_class(base, name, attributes))
+    return (base, classes[0], column_count)
+
+
+def build_tables(prefix: str, table_count: int, column_count: int):
+    '''
+    table_count unrelated classes with column_count columns each, for the whole metadata benchmarks
+    '''
+    base = declarative_base()
+    classes = [
+        _make_class(base, "{}{}".format(prefix, index), _columns(column_count))
+        for index in range(table_count)
+    ]
+    return (base, classes[0], column_count)
+
+
+# levels of relationships expanded by the nested benchmarks
+NESTED_DEPTH = 2
+
+SCENARIOS = {
+    "narrow": lambda: build_flat("Narrow", 5),
+    "tables": lambda: build_tables("Tables", 100, 50),
+    "types": lambda: build_typed("Types"),
+    "wide": lambda: build_flat("Wide", 500),
+    "chain": lambda: build_chain("Chain", 20),
+    "cycle": lambda: build_cycle("Cycle", 10),
+}
+
+
+def _measure(function, repeat: int, number: int) -> dict:
+    timings = [time / number for time in timeit.repeat(function, repeat=repeat, number=number)]
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def _build_schema(model):
+    # the sorted schema is memoized on the model
+    model.__dict__.pop("_sorted_schema", None)
+    return model.__schema__
+
+
+def _build_swagger(api):
+    # api.__schema__ is built once and cached, build the document itself every time
+    return Swagger(api).as_dict()
+
+
+def check_outputs(model, instances, connection):
+    '''
+    raises AssertionError if the compiled marshallers don't return the output of flask_restplus.marshal
+    '''
+    expected = flask_restplus.marshal(instances, model)
+    if get_marshaller(model)(instances) != expected:
+        raise AssertionError("compiled marshaller output of {} differs from marshal".format(model.name))
+    table = get_mapped_class(model).__table__
+    rows = connection.execute(select_for_model(model).order_by(table.c.id)).fetchall()
+    if get_row_marshaller(model)(rows) != expected:
+        raise AssertionError("row marshaller output of {} differs from marshal".format(model.name))
+
+
+def _convert_all(base):
+    # shared nested models are kept per converter class, build them again every time
+    SQLAlchemyModelConverter.clear_shared_models()
+    return convert_all(base)
+
+
+def _get_related_classes(root) -> list:
+    '''
+    returns root and the classes reachable from it through relationships
+    '''
+    classes = [root]
+    for class_ in classes:
+        for relationship_ in sa.inspect(class_).relationships:
+            if relationship_.mapper.class_ not in classes:
+                classes.append(relationship_.mapper.class_)
+    return classes
+
+
+def run_scenario(name: str, rows: int = 1000, repeat: int = 5, number: int = 10) -> list:
+    (base, root, column_count) = SCENARIOS[name]()
+    results = []
+
+    def record(benchmark, function, number=number):
+        result = {"scenario": name, "benchmark": benchmark}
+        result.update(_measure(function, repeat, number))
+        results.append(result)
+
+    converter = SQLAlchemyModelConverter()
+    record("fields_for_model", lambda: converter.fields_for_model(root, include_relationships=True))
+    record("construction", lambda: SQLAlchemyToRestPlus(
+        root.__name__ + "Model", {}, model=root, include_relationships=True, cache=False
+    ))
+
+    model = SQLAlchemyToRestPlus(root.__name__ + "Model", {}, model=root, cache=False)
+    record("schema", lambda: _build_schema(model))
+
+    def build_nested_model():
+        # shared nested models are kept per converter class, build them again every time
+        SQLAlchemyModelConverter.clear_shared_models()
+        return SQLAlchemyToRestPlus(
+            root.__name__ + "NestedModel", {}, model=root, nested_depth=NESTED_DEPTH, cache=False
+        )
+
+    record("nested_construction", build_nested_model)
+    nested_model = build_nested_model()
+
+    # whole metadata: live conversion against loading a build time artifact
+    record("convert_all", lambda: _convert_all(base))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "models.json")
+        build_artifact(base, path)
+        schemas = [
+            {model.name: model.__schema__ for model in models.values()}
+            for models in (load_models(base, path), _convert_all(base))
+        ]
+        if schemas[0] != schemas[1]:
+            raise AssertionError("models of {} loaded from the artifact differ from convert_all".format(name))
+        record("load_models", lambda: load_models(base, path))
+
+    app = flask.Flask(name)
+    api = flask_restplus.Api(app)
+    api.add_model(model.name, model)
+
+    @api.route("/" + name)
+    class Resource(flask_restplus.Resource):
+        @api.marshal_with(model)
+        def get(self):
+            return []
+
+    with app.test_request_context():
+        record("swagger", lambda: _build_swagger(api))
+
+    engine = sa.create_engine("sqlite://")
+    base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    values = _typed_row_values if name == "types" else lambda row: _row_values(column_count, row)
+    for class_ in _get_related_classes(root):
+        # row n of every class refers to row n of the next class
+        links = {"next_id": None} if "next_id" in class_.__table__.c else {}
+        session.bulk_insert_mappings(class_, [
+            dict(values(row), id=row + 1, **dict.fromkeys(links, row + 1)) for row in range(rows)
+        ])
+    session.commit()
+    instances = session.query(root).order_by(root.id).all()
+    check_outputs(model, instances, session.connection())
+
+    record("marshal", lambda: flask_restplus.marshal(instances, model), number=1)
+    marshaller = get_marshaller(model)
+    record("compiled_marshal", lambda: marshaller(instances), number=1)
+
+    # relationships loaded up front, so only marshalling is timed
+    nested_instances = session.query(root).options(
+        *get_loader_options(nested_model, NESTED_DEPTH)
+    ).order_by(root.id).all()
+    nested_marshaller = get_marshaller(nested_model)
+    if nested_marshaller(nested_instances) != flask_restplus.marshal(nested_instances, nested_model):
+        raise AssertionError("compiled marshaller output of {} differs from marshal".format(nested_model.name))
+    record("nested_marshal", lambda: flask_restplus.marshal(nested_instances, nested_model), number=1)
+    record("nested_compiled_marshal", lambda: nested_marshaller(nested_instances), number=1)
+
+    session.close()
+    engine.dispose()
+    return results
+
+
+_IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import {package}
+duration = time.perf_counter() - start
+print(json.dumps({{"seconds": duration, "dialects": sorted(
+    module for module in sys.modules if module.count(".") == 2 and module.startswith("sqlalchemy.dialects.")
+)}}))
+'''
+
+
+def run_import(repeat: int = 5) -> dict:
+    '''
+    times the import of the package in fresh interpreters, and lists the SQLAlchemy dialects it loads
+    '''
+    script = _IMPORT_SCRIPT.format(package=__package__)
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = [
+        json.loads(subprocess.check_output([sys.executable, "-c", script], cwd=cwd).decode())
+        for _ in range(repeat)
+    ]
+    timings = [run["seconds"] for run in runs]
+    return {
+        "scenario": "import",
+        "benchmark": "import",
+        "repeat": repeat,
+        "number": 1,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "dialects": runs[-1]["dialects"],
+    }
+
+
+def get_metadata() -> dict:
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "version": __version__,
+        "python": platform.python_version(),
+        "sqlalchemy": sa.__version__,
+        "flask_restplus": flask_restplus.__version__,
+        "timestamp": dt.datetime.utcnow().isoformat(),
+    }
+
+
+def compare(previous: dict, current: dict) -> list:
+    '''
+    returns (scenario, benchmark, previous median, current median, ratio) for the benchmarks in both runs
+    '''
+    previous_medians = {
+        (result["scenario"], result["benchmark"]): result["median"] for result in previous["results"]
+    }
+    rows = []
+    for result in current["results"]:
+        key = (result["scenario"], result["benchmark"])
+        if key in previous_medians:
+            rows.append(key + (previous_medians[key], result["median"], result["median"] / previous_medians[key]))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenarios to run (default all)")
+    parser.add_argument("--rows", type=int, default=1000, help="rows to marshal")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--output", help="file to write the results to (default stdout)")
+    parser.add_argument("--compare", help="results of a previous run to compare with")
+    parser.add_argument("--skip-import", action="store_true", help="don't time the package import")
+    args = parser.parse_args(argv)
+
+    results = [] if args.skip_import else [run_import(args.repeat)]
+    for name in args.scenario or sorted(SCENARIOS):
+        results += run_scenario(name, rows=args.rows, repeat=args.repeat, number=args.number)
+    run = {"metadata": get_metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(run, output, indent=2)
+    else:
+        json.dump(run, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.compare:
+        with open(args.compare) as previous:
+            for (scenario, benchmark, before, after, ratio) in compare(json.load(previous), run):
+                sys.stderr.write("{:<8} {:<18} {:>12.6f} {:>12.6f} {:>6.2f}x\n".format(
+                    scenario, benchmark, before, after, ratio
+                ))
+
+
+if __name__ == "__main__":
+    main()
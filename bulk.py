@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from flask_restplus import fields
+from sqlalchemy.orm import class_mapper
+
+from .convert import SQLAlchemyModelConverter, MODEL_POSTFIX
+from .schema import SQLAlchemyToRestPlus
+
+
+def get_mapped_classes(source) -> list:
+    '''
+    Returns the mapped classes of a declarative base, a registry, or an iterable of mappers / classes.
+    Classes are sorted by name so the result doesn't depend on declaration order.
+    :param source: declarative Base, registry, or list of mappers or mapped classes
+    '''
+    registry = getattr(source, "registry", source)
+    mappers = getattr(registry, "mappers", None)
+    if mappers is not None:
+        classes = [mapper.class_ for mapper in mappers]
+    elif hasattr(source, "_decl_class_registry"):
+        classes = [value for value in source._decl_class_registry.values() if isinstance(value, type)]
+    else:
+        classes = [getattr(item, "class_", item) for item in source]
+
+    classes = [class_ for class_ in classes if sa.inspect(class_, raiseerr=False) is not None]
+    return sorted(set(classes), key=lambda class_: (class_.__module__, class_.__qualname__))
+
+
+def get_dependency_order(classes) -> list:
+    '''
+    Orders mapped classes so the targets of relationships come before the classes
+    referencing them. Relationship cycles are broken at the class visited first.
+    '''
+    classes = list(classes)
+    known = set(classes)
+    ordered = []
+    visited = set()
+
+    def visit(class_):
+        if class_ in visited:
+            return
+        visited.add(class_)
+        for relationship in class_mapper(class_).relationships:
+            target = relationship.mapper.class_
+            if target in known:
+                visit(target)
+        ordered.append(class_)
+
+    for class_ in classes:
+        visit(class_)
+    return ordered
+
+
+def get_model_name(class_) -> str:
+    '''
+    Returns the name of the generated model for a mapped class,
+    the same name used for nested models of relationships
+    '''
+    return class_.__name__ + MODEL_POSTFIX
+
+
+def convert_all(
+    source,
+    api=None,
+    model_converter=SQLAlchemyModelConverter,
+    include_relationships: bool = True,
+    sorted: bool = True,
+    nested_depth: int = 1,
+) -> OrderedDict:
+    '''
+    Converts every mapped class of source in one pass and optionally registers the models.
+    All classes share one converter. Relationships are nested as the shared models of their target
+    nested_depth levels deep, like SQLAlchemyToRestPlus with nested_depth: deeper relationships and
+    back references (Group.users inside the Group model nested in User.group) are primary key
+    models, so relationship cycles end.
+    :param source: declarative Base, registry, or list of mappers or mapped classes
+    :param api: Api or Namespace to register the models and their nested models with
+    :param model_converter: the model converter class to use (default SQLAlchemyModelConverter)
+    :param include_relationships: include relationship properties
+    :param sorted: sort the model properties
+    :param nested_depth: levels of relationships expanded into nested models
+    :returns: OrderedDict of mapped class -> model, in dependency order
+    '''
+    if nested_depth is None or nested_depth < 0:
+        raise ValueError("`nested_depth` must be a non negative integer.")
+    if not include_relationships:
+        nested_depth = None
+    models = OrderedDict()
+    converter = model_converter(nested_depth=nested_depth)
+
+    for class_ in get_dependency_order(get_mapped_classes(source)):
+        models[class_] = SQLAlchemyToRestPlus(
+            get_model_name(class_),
+            {},
+            model=class_,
+            model_converter=converter,
+            include_relationships=include_relationships,
+            nested_depth=nested_depth,
+            sorted=sorted,
+        )
+
+    if api is not None:
+        register_models(api, models.values())
+        for model in models.values():
+            register_nested_models(api, model)
+
+    return models
+
+
+def link_nested_models(models):
+    '''
+    Points nested fields whose model has the name of one of models at that model.
+    '''
+    models = list(models)
+    models_by_name = {model.name: model for model in models}
+    for model in models:
+        linked = False
+        for field in model.values():
+            nested_field = field if isinstance(field, fields.Nested) else getattr(field, "container", None)
+            if not isinstance(nested_field, fields.Nested):
+                continue
+            target = models_by_name.get(getattr(nested_field.model, "name", None))
+            if target is not None and nested_field.model is not target:
+                nested_field.model = target
+                linked = True
+        if linked:
+            fields_changed = getattr(model, "_fields_changed", None)
+            if fields_changed is not None:
+                # recompiles the marshaller and validator, and drops the resolved copy marshal reads
+                fields_changed()
+            else:
+                model.__dict__.pop("resolved", None)
+
+
+def register_models(api, models):
+    '''
+    Registers models with an Api or Namespace
+    '''
+    for model in models:
+        api.add_model(model.name, model)
+
+
+def register_nested_models(api, model, replace: bool = False):
+    '''
+    Registers the models nested in model, recursively, with an Api or Namespace.
+    Models already registered under their name are skipped, or replaced if replace is set.
+    '''
+    pending = [model]
+    seen = set()
+    while pending:
+        for field in pending.pop().values():
+            nested_field = field if isinstance(field, fields.Nested) else getattr(field, "container", None)
+            if not isinstance(nested_field, fields.Nested):
+                continue
+            nested = nested_field.model
+            if id(nested) in seen:
+                continue
+            seen.add(id(nested))
+            registered = api.models.get(nested.name)
+            if registered is None or (replace and registered is not nested):
+                api.add_model(nested.name, nested)
+                pending.append(nested)
+            elif replace:
+                pending.append(nested)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import threading
+import weakref
+from collections import OrderedDict
+
+from flask_restplus import fields
+from flask_restplus.model import ModelBase
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, class_mapper
+
+from .convert import CacheInfo
+
+
+def freeze(value):
+    '''
+    returns a hashable form of value compared by content: lists and tuples by their items in order,
+    sets and dicts by their items, field instances by class and attributes.
+    Models (mutable, often placeholders) and other unhashable values are compared by identity,
+    keep them alive as long as the key is used.
+    '''
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(freeze(item) for item in value))
+    if isinstance(value, ModelBase):
+        return (ModelBase, id(value))
+    if isinstance(value, dict):
+        return (dict, tuple(sorted(((key, freeze(item)) for (key, item) in value.items()), key=lambda item: item[0])))
+    if isinstance(value, fields.Raw):
+        # fields declared inline are created again on every call
+        return (type(value), freeze(vars(value)))
+    try:
+        hash(value)
+    except TypeError:
+        return (object, id(value))
+    return value
+
+
+class LRUCache():
+    '''
+    A bounded, thread safe mapping that evicts the least recently used entry
+    :param maxsize: maximum number of entries, None for unbounded
+    '''
+    def __init__(self, maxsize: int = 128):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("`maxsize` must be a positive integer or None.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate):
+        '''
+        removes every entry for which predicate(key, value) is true
+        '''
+        with self._lock:
+            for key in [key for (key, value) in self._data.items() if predicate(key, value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, len(self._data))
+
+
+# the conversion caches dropping the entries of classes whose mapper is configured, notified by
+# one listener registered on first use so the caches themselves can be garbage collected
+_listening_caches = weakref.WeakSet()
+
+
+def _on_mapper_configured(mapper, class_):
+    for cache in list(_listening_caches):
+        cache.invalidate(class_)
+
+
+class ConversionCache(LRUCache):
+    '''
+    LRU cache for the fields generated by SQLAlchemyToRestPlusMeta.
+    Entries of a mapped class are dropped when its mapper is configured again,
+    and are ignored when properties were added to the mapper since they were stored.
+    The cache is notified by a module level listener and can be garbage collected, close() stops it.
+
+    To enable it for all models:
+    SQLAlchemyToRestPlus.conversion_cache = ConversionCache(maxsize=512)
+    or per call with the `cache` argument.
+    '''
+    def __init__(self, maxsize: int = 256):
+        super().__init__(maxsize)
+        if not event.contains(Mapper, "mapper_configured", _on_mapper_configured):
+            event.listen(Mapper, "mapper_configured", _on_mapper_configured)
+        _listening_caches.add(self)
+
+    def close(self):
+        '''
+        stops invalidating entries when mappers are configured
+        '''
+        _listening_caches.discard(self)
+
+    @staticmethod
+    def make_key(model, model_converter, only, exclude, include_relationships, declared_fields, nested_depth=None) -> tuple:
+        '''
+        builds the cache key for a conversion, declared fields are keyed by identity
+        '''
+        return (
+            model,
+            model_converter,
+            frozenset(only) if only else None,
+            frozenset(exclude) if exclude else None,
+            bool(include_relationships),
+            tuple(sorted((name, id(field)) for (name, field) in declared_fields.items())),
+            nested_depth,
+        )
+
+    def get_fields(self, key, dict_cls=dict):
+        '''
+        returns a copy of the cached fields for key, or None
+        '''
+        entry = self.get(key)
+        if entry is None:
+            return None
+        (attrs, declared_fields, model_fields) = entry
+        if attrs is not class_mapper(key[0]).attrs:
+            # properties were added to the mapper since the entry was stored
+            self.delete(key)
+            return None
+        return dict_cls(model_fields)
+
+    def set_fields(self, key, declared_fields, model_fields):
+        '''
+        stores the generated fields. declared_fields is kept alive with the entry
+        so the identities in the key can't be reused.
+        '''
+        self.set(key, (class_mapper(key[0]).attrs, declared_fields, dict(model_fields)))
+
+    def invalidate(self, model):
+        '''
+        removes all entries of a mapped class
+        '''
+        self.discard_where(lambda key, value: key[0] is model)
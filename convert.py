@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 import inspect
+import threading
 import uuid
 import datetime as dt
 import decimal
+from time import perf_counter
 from flask_restplus import fields, Model
-from sqlalchemy.dialects import postgresql, mysql, mssql
 import sqlalchemy as sa
 
 from .exceptions import ModelConversionError
-from .fields import Enum, UUID
+from .fields import Enum, UUID, get_primary_keys
+from .instrumentation import instrumentation
 
 def _is_field(value):
     return isinstance(value, type) and issubclass(value, fields.Raw)
@@ -18,6 +20,202 @@ from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.relationships import RelationshipProperty
 import collections
 
+# snapshot of the resolution cache statistics, mirrors functools.lru_cache
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "currsize"])
+
+
+class VersionedDict(dict):
+    '''
+    dict that counts its mutations, so caches derived from a mapping
+    can tell when the mapping has changed.
+    '''
+    version = 0
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.version += 1
+
+    def clear(self):
+        dict.clear(self)
+        self.version += 1
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self.version += 1
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self.version += 1
+        return item
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        self.version += 1
+        return value
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+# entry point group of third party type mappings: the name is the module prefix of the types,
+# the object a loader(registry) adding their mappings
+TYPE_MAPPING_ENTRY_POINTS = "flask_restplus_sqlalchemy.type_mappings"
+
+
+def _iter_entry_points(group: str) -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return list(pkg_resources.iter_entry_points(group))
+    found = entry_points()
+    if hasattr(found, "select"):
+        return list(found.select(group=group))
+    return list(found.get(group, []))
+
+
+class TypeRegistry(VersionedDict):
+    '''
+    SQLA type class -> restplus field class mapping that loads the mappings of the types of a module
+    (e.g. a dialect) when a type from that module is first resolved, so unused dialects are never imported.
+    Loaders are registered per module prefix with add_loader or the TYPE_MAPPING_ENTRY_POINTS entry points.
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loaders = {}
+        self._seen_modules = set()
+        self._seen_types = set()
+        self._entry_points_loaded = False
+        self._lock = threading.RLock()
+
+    def add_loader(self, module: str, loader):
+        '''
+        registers loader(registry), called once when a type of module (or a submodule) is first resolved
+        '''
+        with self._lock:
+            self.loaders.setdefault(module, []).append(loader)
+            seen = any(_in_module(name, module) for name in self._seen_modules)
+        if seen:
+            self._run_loaders(module)
+
+    def load_for(self, type_class):
+        '''
+        loads the mappings registered for the modules of type_class and its bases, if not loaded yet
+        '''
+        if type_class in self._seen_types:
+            return
+        with self._lock:
+            if not self._entry_points_loaded:
+                self._entry_points_loaded = True
+                for entry_point in _iter_entry_points(TYPE_MAPPING_ENTRY_POINTS):
+                    self.loaders.setdefault(entry_point.name, []).append(
+                        lambda registry, entry_point=entry_point: entry_point.load()(registry)
+                    )
+            modules = set(getattr(col_type, "__module__", None) for col_type in inspect.getmro(type_class))
+            modules -= self._seen_modules
+            self._seen_modules.update(modules)
+            prefixes = [
+                prefix for prefix in self.loaders if any(_in_module(module, prefix) for module in modules if module)
+            ]
+        for prefix in prefixes:
+            self._run_loaders(prefix)
+        self._seen_types.add(type_class)
+
+    def _run_loaders(self, prefix: str):
+        with self._lock:
+            loaders = self.loaders.pop(prefix, [])
+            for loader in loaders:
+                loader(self)
+
+
+def _in_module(module: str, prefix: str) -> bool:
+    return module == prefix or module.startswith(prefix + ".")
+
+
+def _load_postgresql_types(registry):
+    from sqlalchemy.dialects import postgresql
+    registry.update({
+        postgresql.BIT: fields.Integer,
+        postgresql.UUID: UUID,
+        postgresql.MACADDR: fields.String,
+        postgresql.INET: fields.String,
+        postgresql.JSON: fields.Raw,
+        postgresql.JSONB: fields.Raw,
+        postgresql.HSTORE: fields.Raw,
+    })
+    if hasattr(postgresql, "MONEY"):
+        registry[postgresql.MONEY] = fields.Arbitrary
+
+
+def _load_mysql_types(registry):
+    from sqlalchemy.dialects import mysql
+    registry.update({
+        mysql.BIT: fields.Integer,
+        mysql.YEAR: fields.Integer,
+        mysql.SET: fields.List,
+        mysql.ENUM: Enum,
+    })
+
+
+def _load_mssql_types(registry):
+    from sqlalchemy.dialects import mssql
+    registry[mssql.BIT] = fields.Integer
+
+
+def mapping_token(mapping):
+    '''
+    returns a value that changes whenever the mapping is replaced or mutated.
+    plain dicts (e.g. overridden in a subclass) are compared by content.
+    '''
+    version = getattr(mapping, "version", None)
+    if version is None:
+        return (id(mapping), tuple(mapping.items()))
+    return (id(mapping), version)
+
+
+def class_cache(cls, name: str, factory):
+    '''
+    returns a cache object stored on cls itself (not inherited from a parent class),
+    creating it with factory if it does not exist yet.
+    '''
+    cache = cls.__dict__.get(name)
+    if cache is None:
+        cache = factory()
+        setattr(cls, name, cache)
+    return cache
+
+
+def _get_nested_model(field):
+    '''
+    returns the model of a nested field or of the nested field in a list, None for other fields
+    '''
+    nested_field = field if isinstance(field, fields.Nested) else getattr(field, "container", None)
+    return nested_field.model if isinstance(nested_field, fields.Nested) else None
+
+
+class _TypeResolutionCache():
+    '''
+    cache of SQLA type -> restplus field class, valid for one state of the type mappings
+    '''
+    def __init__(self):
+        self.token = None
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
 def multi_getattr(obj, attr: str, default = None):
     """
     Get a named attribute from an object; multi_getattr(x, 'a.b.c.d') is
@@ -55,20 +253,52 @@ def getitem_by_index(obj, attr: str, default=None):
             return default
     return obj
 
+class PropertyGetter():
+    '''
+    callable returned by prop_2_lambda. Keeps the attribute path already split so
+    the converter can compile it into a kwargs extraction plan.
+    '''
+    __slots__ = ("path", "default")
+
+    def __init__(self, propname: str, default=None):
+        self.path = tuple(propname.split("."))
+        self.default = default
+
+    def __call__(self, converter, prop):
+        for attr in self.path:
+            try:
+                prop = getattr(prop, attr)
+            except AttributeError:
+                return self.default
+        return prop
+
 def prop_2_lambda(propname: str, default=None):
     '''
     helper function
-    Creates a lambda expression that has the propname and default value already specified
+    Creates a callable that has the propname and default value already specified
     for the multi_getattr function. self is provided for compatibility with FIELD_MAPPING
     '''
-    return lambda self, prop: multi_getattr(prop, propname, default)
+    return PropertyGetter(propname, default)
+
+
+class _KwargsPlanCache():
+    '''
+    compiled kwargs extraction plans per field class, valid for one state of the field mappings
+    '''
+    def __init__(self):
+        self.token = None
+        self.plans = {}
 
 # name to append to end of the auto generated models of relationship properties
 MODEL_POSTFIX = "Model"
+# name to append to the shared models of relationships, formatted with the remaining depth
+NESTED_MODEL_POSTFIX = "Nested{}" + MODEL_POSTFIX
+# name to append to the primary key only models of relationships that are not expanded
+REFERENCE_MODEL_POSTFIX = "Ref" + MODEL_POSTFIX
 
 class SQLAlchemyModelConverter():
     # maps python types to restplus types
-    PYTHON_TYPE_MAPPING = {
+    PYTHON_TYPE_MAPPING = VersionedDict({
         str: fields.String,
         bytes: fields.String,
         dt.datetime: fields.DateTime,
@@ -81,80 +311,88 @@ class SQLAlchemyModelConverter():
         uuid.UUID: UUID,
         dt.time: fields.DateTime,
         dt.date: fields.DateTime,
-        decimal.Decimal: fields.Decimal,
-    }
+        decimal.Decimal: fields.Arbitrary,
+    })
 
     # sets the default mapping for kwargs on restplus fields to a lambda function to get the value for kwargs from a column or relationship
-    DEFAULT_FIELD_MAPPING = {
+    DEFAULT_FIELD_MAPPING = VersionedDict({
         "required" :  lambda self, prop: not getattr(prop, "nullable", True),
         "description" : prop_2_lambda("description"),
         #"default" : prop_2_lambda("default"),
-    }
+    })
 
     """
     maps a restplus field to dictionary where the value is a lambda function to get the value for kwargs from a column or relationship
     the key is the kwargs key
     the lookup is: Field.Class -> dict { "constructor_arg_name" : (lambda(SQLAlchemyModelConverter, SqlAlchemy_Object_property) -> value_for_arg ) } 
+    use VersionedDict for the inner dicts too, plain dicts are compared by content on every lookup
     """
-    FIELD_MAPPING = {
-        fields.String: {
+    FIELD_MAPPING = VersionedDict({
+        fields.String: VersionedDict({
             "max_length" : prop_2_lambda("length"),
-        },
-        fields.DateTime: {},
-        fields.Float: {},
-        fields.Boolean: {},
-        fields.Raw: {},
-        fields.List: {
+        }),
+        fields.DateTime: VersionedDict(),
+        fields.Float: VersionedDict(),
+        fields.Boolean: VersionedDict(),
+        fields.Raw: VersionedDict(),
+        fields.List: VersionedDict({
             "cls_or_instance" : lambda self, prop: self._get_field_class_for_data_type(multi_getattr(prop, "type.item_type")) or fields.Raw,
             "max_items" : prop_2_lambda("length"), 
             "unique" : prop_2_lambda("unique"),
-        },
-        fields.Integer: {},
-        UUID: { 
-            "max_length" : prop_2_lambda("length"),
-        },
-        fields.Decimal: { 
+        }),
+        fields.Integer: VersionedDict(),
+        UUID: VersionedDict({
             "max_length" : prop_2_lambda("length"),
-        },
-        Enum: { 
+        }),
+        fields.Arbitrary: VersionedDict(),
+        Enum: VersionedDict({
             "max_length" : prop_2_lambda("length"),
             "enum" : prop_2_lambda("type.enums"),
-        },
-        fields.Nested: {
+        }),
+        fields.Nested: VersionedDict({
             "required" : None,
-            "model" : lambda self, prop: Model(prop.mapper.class_.__name__ + MODEL_POSTFIX, {}),#self._get_field_class_for_data_type(getitem_by_index(list(getattr(prop, "local_columns", set())), "[0].type")) or fields.Raw,
+            "model" : lambda self, prop: self.get_nested_model(prop),#self._get_field_class_for_data_type(getitem_by_index(list(getattr(prop, "local_columns", set())), "[0].type")) or fields.Raw,
             "allow_null" : lambda self, prop: getitem_by_index(list(getattr(prop, "local_columns", set())), "[0].nullable"),
             #"skip_none" : lambda self, prop: None,
             "as_list" : prop_2_lambda("uselist"),
-        },
-    }
+        }),
+    })
 
     # maps the SQLA type to a restplus field
     # SQLA field class -> restplus field class
-    SQLA_TYPE_MAPPING = {
+    SQLA_TYPE_MAPPING = VersionedDict({
         sa.Enum: Enum,
-        postgresql.BIT: fields.Integer,
-        postgresql.UUID: UUID,
-        postgresql.MACADDR: fields.String,
-        postgresql.INET: fields.String,
-        postgresql.JSON: fields.Raw,
-        postgresql.JSONB: fields.Raw,
-        postgresql.HSTORE: fields.Raw,
         sa.ARRAY: fields.List,
-        mysql.BIT: fields.Integer,
-        mysql.YEAR: fields.Integer,
-        mysql.SET: fields.List,
-        mysql.ENUM: Enum,
-        mssql.BIT: fields.Integer,
         sa.sql.sqltypes.NullType: fields.Raw,
-    }
+    })
 
     if hasattr(sa, "JSON"):
         SQLA_TYPE_MAPPING[sa.JSON] = fields.Raw
-    if hasattr(postgresql, "MONEY"):
-        SQLA_TYPE_MAPPING[postgresql.MONEY] = fields.Arbitrary
 
-    
+    # same as SQLA_TYPE_MAPPING for the dialect and third party types, loaded when a type of
+    # their module is first resolved. For the same type class SQLA_TYPE_MAPPING takes precedence.
+    LAZY_TYPE_MAPPING = TypeRegistry()
+    LAZY_TYPE_MAPPING.add_loader("sqlalchemy.dialects.postgresql", _load_postgresql_types)
+    LAZY_TYPE_MAPPING.add_loader("sqlalchemy.dialects.mysql", _load_mysql_types)
+    LAZY_TYPE_MAPPING.add_loader("sqlalchemy.dialects.mssql", _load_mssql_types)
+
+    # opt-in FieldInterner sharing identical field instances, None creates a field per property
+    interner = None
+
+    def __init__(self, nested_models: dict = None, nested_depth: int = None):
+        '''
+        :param nested_models: dict of SQLAlchemy class -> restplus model to use for relationships to that class
+        :param nested_depth: expand relationships into shared models of their target, this many levels deep.
+                             None uses placeholder models instead.
+        '''
+        self.nested_models = nested_models if nested_models is not None else {}
+        self.nested_depth = nested_depth
+        # classes being converted, and levels of relationships left to expand
+        self._stack = []
+        self._depth = nested_depth
+        # whether a shared model is being built, it can be nested in any class referring to it
+        self._shared = False
+
     def fields_for_model(
         self,
         model,
@@ -164,12 +402,26 @@ class SQLAlchemyModelConverter():
         dict_cls=dict,
         include_relationships: bool = False
     ) -> dict:
+        instrumented = instrumentation.enabled
+        if instrumented:
+            start = perf_counter()
+
+        if not self._stack:
+            self._depth = self.nested_depth
+        self._stack.append(model)
+
         result = dict_cls()
         declared_fields = declared_fields or {}
-        for prop in self.get_property_iterator(model, only, exclude, include_relationships):
-            field = declared_fields.get(prop.key) or self.sql_property2field(prop)
-            if field:
-                result[prop.key] = field
+        try:
+            for prop in self.get_property_iterator(model, only, exclude, include_relationships):
+                field = declared_fields.get(prop.key) or self.sql_property2field(prop)
+                if field:
+                    result[prop.key] = field
+        finally:
+            self._stack.pop()
+
+        if instrumented:
+            instrumentation.record("model_conversion", model.__name__, perf_counter() - start)
         return result
 
     def get_property_iterator(self, class_, only, exclude, include_relationships):
@@ -211,7 +463,19 @@ class SQLAlchemyModelConverter():
         maps a sql alchemy property to a restplus field, gets the kwargs, and returns an instance of
         restplus field.
         """
-        field_instance = None
+        spec = self.sql_property2spec(prop)
+        if spec is None:
+            return None
+        (field_class, field_kwargs) = spec
+        if self.interner is not None:
+            return self.interner.get(field_class, field_kwargs)
+        return field_class(**field_kwargs)
+
+    def sql_property2spec(self, prop):
+        """
+        maps a sql alchemy property to the restplus field class and the kwargs to create it with.
+        returns a (field_class, field_kwargs) tuple, or None if the property has no field.
+        """
         proptype = type(prop)
 
         if proptype is ColumnProperty:
@@ -219,17 +483,14 @@ class SQLAlchemyModelConverter():
             field_class = self.get_field_class_for_column(column)
             if not field_class:
                 return None
+            return (field_class, self.get_field_kwargs_for_column(field_class, column))
 
-            field_kwargs = self.get_field_kwargs_for_column(field_class, column)
-            field_instance = field_class(**field_kwargs)
-            
         elif proptype is RelationshipProperty:
             field_class = self.get_field_class_for_relationship(prop)
             if not field_class:
                 return None
-            field_kwargs = self.get_field_kwargs_for_relationship(field_class, prop)
-            field_instance = field_class(**field_kwargs)
-        return field_instance
+            return (field_class, self.get_field_kwargs_for_relationship(field_class, prop))
+        return None
 
     def get_field_class_for_column(self, column: ColumnProperty):
         '''
@@ -243,17 +504,7 @@ class SQLAlchemyModelConverter():
         through DEFAULT_FIELD_MAPPING + FIELD_MAPPING, then gets the value for the field
         by calling the lambda expression specified.
         '''
-        field_kwargs = {}
-        field_map = self.DEFAULT_FIELD_MAPPING.copy()
-        field_map.update(self.FIELD_MAPPING[field_class])
-
-        for (field_name, field_value) in field_map.items():
-            arg_value = field_value(self, column)
-            if arg_value is not None:
-                field_kwargs[field_name] = arg_value
-
-        return field_kwargs
-
+        return self._extract_field_kwargs(field_class, column)
 
     def get_field_class_for_relationship(self, relationship: RelationshipProperty):
         '''
@@ -261,6 +512,105 @@ class SQLAlchemyModelConverter():
         '''
         return fields.Nested
 
+    def get_nested_model(self, relationship: RelationshipProperty):
+        '''
+        Returns the model used by the nested field of a relationship. Uses the model
+        of the target class from nested_models if there is one, otherwise an empty
+        placeholder model named after the target class that must be registered separately.
+        '''
+        target_class = relationship.mapper.class_
+        model = self.nested_models.get(target_class)
+        if model is not None:
+            return model
+        if self.nested_depth is None:
+            return Model(target_class.__name__ + MODEL_POSTFIX, {})
+        if self._depth <= 0 or target_class in self._stack or self._is_back_reference(relationship):
+            # out of depth, or a back reference to a class being converted or nesting the model
+            return self.get_reference_model(target_class)
+        return self.get_shared_model(target_class, self._depth - 1)
+
+    def _is_back_reference(self, relationship: RelationshipProperty) -> bool:
+        '''
+        Whether relationship leads back to a class that can nest the shared model being built,
+        that is its target has a relationship to the class owning it (Group.users in the shared
+        model of Group nested in User.group). Top level models are nested in nothing.
+        '''
+        if not self._shared:
+            return False
+        class_ = relationship.parent.class_
+        return any(
+            issubclass(class_, other.mapper.class_)
+            for other in relationship.mapper.relationships
+        )
+
+    def get_shared_model(self, class_, depth: int):
+        '''
+        Returns the model of class_ with its relationships expanded depth levels deep.
+        The model is built once per converter class and depth and then shared by every
+        relationship to class_. It only depends on class_ and depth: relationships back to class_
+        or to a class with a relationship to class_ (the classes it can be nested in) are
+        references, the others are expanded until depth runs out.
+        '''
+        shared_models = class_cache(type(self), "_shared_models", dict)
+        key = (class_, depth)
+        model = shared_models.get(key)
+        if model is None:
+            saved = (self._depth, self._stack, self._shared)
+            self._depth = depth
+            # converted apart from the classes being converted now, which depend on the order
+            # models are built in; a non empty stack also keeps fields_for_model from resetting depth.
+            # the classes it is nested in are found by _is_back_reference instead.
+            self._stack = [class_]
+            self._shared = True
+            try:
+                model_fields = self.fields_for_model(class_, include_relationships=True)
+            finally:
+                (self._depth, self._stack, self._shared) = saved
+            model = Model(class_.__name__ + NESTED_MODEL_POSTFIX.format(depth), model_fields)
+            model.__sqla_model__ = class_
+            model = shared_models.setdefault(key, model)
+        return model
+
+    def get_reference_model(self, class_):
+        '''
+        Returns the shared model holding only the primary key of class_, used for
+        relationships that are not expanded.
+        '''
+        shared_models = class_cache(type(self), "_shared_models", dict)
+        key = (class_, None)
+        model = shared_models.get(key)
+        if model is None:
+            model_fields = {}
+            for prop in get_primary_keys(class_):
+                field = self.sql_property2field(prop)
+                if field:
+                    model_fields[prop.key] = field
+            model = Model(class_.__name__ + REFERENCE_MODEL_POSTFIX, model_fields)
+            model.__sqla_model__ = class_
+            model = shared_models.setdefault(key, model)
+        return model
+
+    @classmethod
+    def clear_shared_models(cls, class_=None, dependents: bool = False):
+        '''
+        Drops the shared nested models of this converter class, only those of class_ if given.
+        With dependents the shared models nesting a dropped model are dropped too, at any depth.
+        '''
+        shared_models = class_cache(cls, "_shared_models", dict)
+        dropped = set(id(model) for (key, model) in shared_models.items() if class_ is None or key[0] is class_)
+        pending = dependents and class_ is not None
+        while pending:
+            pending = False
+            for model in shared_models.values():
+                if id(model) not in dropped and any(
+                    id(_get_nested_model(field)) in dropped for field in model.values()
+                ):
+                    dropped.add(id(model))
+                    pending = True
+        for (key, model) in list(shared_models.items()):
+            if id(model) in dropped:
+                del shared_models[key]
+
     def get_field_kwargs_for_relationship(self, field_class: fields.Raw, relationship: RelationshipProperty) -> dict:
         '''
         Same as get_field_kwargs_for_column
@@ -269,22 +619,174 @@ class SQLAlchemyModelConverter():
         by calling the lambda expression specified.
         returns a dict of field name: value pairs for use with kwargs
         '''
+        return self._extract_field_kwargs(field_class, relationship)
+
+    def _extract_field_kwargs(self, field_class: fields.Raw, prop) -> dict:
+        '''
+        Runs the compiled kwargs plan of field_class against a column or relationship.
+        kwargs whose value is None are left out.
+        '''
         field_kwargs = {}
-        field_map = self.DEFAULT_FIELD_MAPPING.copy()
-        field_map.update(self.FIELD_MAPPING[field_class])
+        for (field_name, path, default, getter) in self._get_kwargs_plan(field_class):
+            if getter is None:
+                arg_value = prop
+                for attr in path:
+                    try:
+                        arg_value = getattr(arg_value, attr)
+                    except AttributeError:
+                        arg_value = default
+                        break
+            else:
+                arg_value = getter(self, prop)
+            if arg_value is not None:
+                field_kwargs[field_name] = arg_value
+        return field_kwargs
 
-        for (field_name, field_value) in field_map.items():
-            if field_value is not None:
-                arg_value = field_value(self, relationship)
-                if arg_value is not None:
-                    field_kwargs[field_name] = arg_value
+    def _get_kwargs_plan(self, field_class: fields.Raw) -> tuple:
+        '''
+        Returns the kwargs extraction plan of field_class, compiling it from
+        DEFAULT_FIELD_MAPPING + FIELD_MAPPING when the mappings changed.
+        '''
+        cache = class_cache(type(self), "_kwargs_plan_cache", _KwargsPlanCache)
+        token = (mapping_token(self.DEFAULT_FIELD_MAPPING), mapping_token(self.FIELD_MAPPING))
+        if cache.token != token:
+            cache.plans.clear()
+            cache.token = token
 
-        return field_kwargs
+        field_map = self.FIELD_MAPPING[field_class]
+        field_map_token = mapping_token(field_map)
+        entry = cache.plans.get(field_class)
+        hit = entry is not None and entry[0] == field_map_token
+        if not hit:
+            entry = cache.plans[field_class] = (field_map_token, self._compile_kwargs_plan(field_map))
+        if instrumentation.enabled:
+            instrumentation.record("cache", "kwargs_plan", result="hit" if hit else "miss")
+        return entry[1]
+
+    def _compile_kwargs_plan(self, field_map: dict) -> tuple:
+        '''
+        Flattens DEFAULT_FIELD_MAPPING + field_map into a tuple of
+        (kwarg name, attribute path, default, getter) entries. Entries built with
+        prop_2_lambda are resolved through their attribute path, anything else is called.
+        '''
+        merged_map = self.DEFAULT_FIELD_MAPPING.copy()
+        merged_map.update(field_map)
+
+        plan = []
+        for (field_name, field_value) in merged_map.items():
+            if field_value is None:
+                continue
+            if isinstance(field_value, PropertyGetter):
+                plan.append((field_name, field_value.path, field_value.default, None))
+            else:
+                plan.append((field_name, None, None, field_value))
+        return tuple(plan)
+
+    @classmethod
+    def type_cache_info(cls) -> CacheInfo:
+        '''
+        Returns the hit/miss statistics of the type resolution cache of this converter class
+        '''
+        cache = class_cache(cls, "_type_resolution_cache", _TypeResolutionCache)
+        return CacheInfo(cache.hits, cache.misses, len(cache.entries))
+
+    @classmethod
+    def clear_type_cache(cls):
+        '''
+        Clears the type resolution cache of this converter class
+        '''
+        setattr(cls, "_type_resolution_cache", _TypeResolutionCache())
+
+    def _type_cache_key(self, data_type):
+        '''
+        Returns the key used to cache the field class of a data type.
+        The key is the type class plus the instance state the resolution reads: the python_type
+        (Numeric.asdecimal picks Decimal or float), the impl of a TypeDecorator and the item_type of an ARRAY
+        '''
+        try:
+            python_type = data_type.python_type
+        except NotImplementedError:
+            python_type = None
+        impl = getattr(data_type, "impl", None)
+        item_type = getattr(data_type, "item_type", None)
+        if impl is None and item_type is None:
+            return (type(data_type), python_type)
+        return (
+            type(data_type),
+            python_type,
+            None if impl is None else self._type_cache_key(impl),
+            None if item_type is None else self._type_cache_key(item_type),
+        )
 
     def _get_field_class_for_data_type(self, data_type):
         '''
         Gets the restplus field class for the specified data type
-        uses SQLA_TYPE_MAPPING to lookup the target type for the field
+        results are cached per converter class, see _resolve_field_class_for_data_type
+        '''
+        cache = class_cache(type(self), "_type_resolution_cache", _TypeResolutionCache)
+        self._load_type_mappings(data_type)
+        token = (
+            mapping_token(self.SQLA_TYPE_MAPPING),
+            mapping_token(self.LAZY_TYPE_MAPPING),
+            mapping_token(self.PYTHON_TYPE_MAPPING),
+        )
+        if cache.token != token:
+            cache.entries.clear()
+            cache.token = token
+
+        instrumented = instrumentation.enabled
+        if instrumented:
+            start = perf_counter()
+
+        key = self._type_cache_key(data_type)
+        try:
+            field_cls = cache.entries[key]
+        except KeyError:
+            cache.misses += 1
+            field_cls = cache.entries[key] = self._resolve_field_class_for_data_type(data_type)
+            path = None
+        else:
+            cache.hits += 1
+            path = "cache"
+
+        if instrumented:
+            duration = perf_counter() - start
+            if path is None:
+                path = self._get_resolution_path(data_type)
+            instrumentation.record("type_resolution", type(data_type).__name__, duration, path=path)
+            instrumentation.record("cache", "type_resolution", result="miss" if path != "cache" else "hit")
+        return field_cls
+
+    def _load_type_mappings(self, data_type):
+        '''
+        Loads the LAZY_TYPE_MAPPING mappings of the modules of the type class of data_type and its bases
+        '''
+        load_for = getattr(self.LAZY_TYPE_MAPPING, "load_for", None)
+        if load_for is not None:
+            load_for(type(data_type))
+
+    def _get_resolution_path(self, data_type) -> str:
+        '''
+        Returns which lookup of _resolve_field_class_for_data_type finds the field class
+        of data_type: mro (SQLA_TYPE_MAPPING, LAZY_TYPE_MAPPING), python_type (PYTHON_TYPE_MAPPING) or impl
+        '''
+        if any(
+            col_type in self.SQLA_TYPE_MAPPING or col_type in self.LAZY_TYPE_MAPPING
+            for col_type in inspect.getmro(type(data_type))
+        ):
+            return "mro"
+        try:
+            python_type = data_type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type in self.PYTHON_TYPE_MAPPING:
+            return "python_type"
+        return "impl"
+
+    def _resolve_field_class_for_data_type(self, data_type):
+        '''
+        Gets the restplus field class for the specified data type
+        uses SQLA_TYPE_MAPPING and LAZY_TYPE_MAPPING to lookup the target type for the field
         '''
         field_cls = None
         types = inspect.getmro(type(data_type))
@@ -293,6 +795,9 @@ class SQLAlchemyModelConverter():
             if col_type in self.SQLA_TYPE_MAPPING:
                 field_cls = self.SQLA_TYPE_MAPPING[col_type]
                 break
+            if col_type in self.LAZY_TYPE_MAPPING:
+                field_cls = self.LAZY_TYPE_MAPPING[col_type]
+                break
         else:
             # Try to find a field class based on the column's python_type
             try:
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from sqlalchemy.orm.properties import ColumnProperty
+
+from .loading import get_mapped_class, iter_model_properties
+from .marshalling import compile_row_marshaller
+
+# select() takes the columns positionally from SQLAlchemy 1.4 on
+_SELECT_POSITIONAL = tuple(int(part) for part in sa.__version__.split(".")[:2]) >= (1, 4)
+
+
+def get_column_map(model) -> OrderedDict:
+    '''
+    Returns the field key -> Column mapping of the fields of a generated model backed by a column,
+    in the order of the model fields.
+    :param model: a model generated by SQLAlchemyToRestPlus
+    '''
+    return OrderedDict(
+        (key, prop.columns[0])
+        for (key, field, prop) in iter_model_properties(model, get_mapped_class(model))
+        if type(prop) is ColumnProperty
+    )
+
+
+def select_for_model(model):
+    '''
+    Returns a Core select() of the columns behind the fields of model, labeled with the field keys
+    and in the order get_row_marshaller(model) reads them.
+    :param model: a model generated by SQLAlchemyToRestPlus
+    '''
+    columns = [column.label(key) for (key, column) in get_column_map(model).items()]
+    if _SELECT_POSITIONAL:
+        return sa.select(*columns)
+    return sa.select(columns)
+
+
+def get_row_marshaller(model, keys=None):
+    '''
+    Returns a function marshalling Core rows (or tuples) with model, without building ORM instances.
+    rows = connection.execute(select_for_model(model)).fetchall()
+    get_row_marshaller(model)(rows)
+    :param model: a model generated by SQLAlchemyToRestPlus
+    :param keys: field keys of the row columns in order (default: the columns of select_for_model)
+    '''
+    if keys is None:
+        keys = get_column_map(model).keys()
+    keys = tuple(keys)
+    version = getattr(model, "_fields_version", None)
+    cached = model.__dict__.get("_compiled_row_marshallers")
+    if cached is None or cached[0] != version:
+        cached = model._compiled_row_marshallers = (version, {})
+    marshaller = cached[1].get(keys)
+    if marshaller is None:
+        marshaller = cached[1][keys] = compile_row_marshaller(model, keys)
+    return marshaller
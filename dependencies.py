@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import threading
+import weakref
+
+from flask_restplus import fields
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, class_mapper
+from sqlalchemy.orm.relationships import RelationshipProperty
+
+from .bulk import register_nested_models
+from .schema import SQLAlchemyToRestPlusMeta
+
+
+def _class_key(class_) -> str:
+    # classes are tracked by name so a class declared again (hot reload) replaces the old one
+    return "{}.{}".format(class_.__module__, class_.__qualname__)
+
+
+def get_model_dependencies(model) -> set:
+    '''
+    Returns the mapped classes a generated model is derived from: its own class and
+    the classes reached through its relationships and nested models, recursively.
+    '''
+    classes = set()
+    pending = [model]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        class_ = getattr(current, "__sqla_model__", None)
+        mapper = None
+        if class_ is not None:
+            classes.add(class_)
+            mapper = class_mapper(class_)
+        for (key, field) in current.items():
+            if mapper is not None and mapper.has_property(key):
+                prop = mapper.get_property(key)
+                if type(prop) is RelationshipProperty:
+                    classes.add(prop.mapper.class_)
+            nested_field = field if isinstance(field, fields.Nested) else getattr(field, "container", None)
+            if isinstance(nested_field, fields.Nested) and isinstance(nested_field.model, dict):
+                pending.append(nested_field.model)
+    return classes
+
+
+# every ModelIndex, notified by listeners registered once so the indexes can be garbage collected
+_indexes = weakref.WeakSet()
+_instrumented_classes = weakref.WeakSet()
+
+
+def _on_mapper_configured(mapper, class_):
+    for index in list(_indexes):
+        if index.listen:
+            index._on_mapper_configured(mapper, class_)
+
+
+def _on_after_configured():
+    for index in list(_indexes):
+        if index.listen:
+            index.refresh()
+
+
+def _on_attribute_instrument(class_, key, inst):
+    for index in list(_indexes):
+        index._on_attribute_instrument(class_, key, inst)
+
+
+class ModelIndex():
+    '''
+    Index of mapped class -> generated models derived from it.
+    When mappers are configured (new or redeclared classes) or properties are added to a
+    tracked class, only the affected models are regenerated, in place, and registered again
+    with the Api/Namespace objects they were registered with.
+    Regeneration runs after mappers are configured; Mapper.add_property doesn't configure
+    mappers again, call refresh() after it. The shared nested models of the changed classes,
+    and those nesting them, are converted again; the others are kept.
+    The index is notified by module level listeners and can be garbage collected, close() stops it.
+
+    To track every generated model:
+    SQLAlchemyToRestPlus.model_index = ModelIndex()
+    :param listen: regenerate when mappers are configured, otherwise only on refresh()
+    '''
+    def __init__(self, listen: bool = True):
+        self.listen = listen
+        self._models = {}
+        self._apis = {}
+        self._classes = {}
+        self._dirty = set()
+        self._lock = threading.RLock()
+        if listen and not event.contains(Mapper, "mapper_configured", _on_mapper_configured):
+            event.listen(Mapper, "mapper_configured", _on_mapper_configured)
+            event.listen(Mapper, "after_configured", _on_after_configured)
+        _indexes.add(self)
+
+    def close(self):
+        '''
+        Stops listening to mapper and attribute events
+        '''
+        _indexes.discard(self)
+
+    def track(self, model, api=None):
+        '''
+        Adds a generated model to the index, and the api it is registered with if given.
+        Models without conversion options (not built from a SQLAlchemy model) can't be
+        regenerated and aren't tracked.
+        '''
+        if getattr(model, "__sqla_options__", None) is None:
+            return
+        with self._lock:
+            reference = weakref.ref(model)
+            for class_ in get_model_dependencies(model):
+                key = _class_key(class_)
+                self._classes.setdefault(key, class_)
+                self._models.setdefault(key, {})[id(model)] = reference
+                self._listen_attributes(class_)
+            if api is not None:
+                self._apis.setdefault(id(model), []).append(api)
+
+    def register(self, api, model):
+        '''
+        Registers a generated model with an Api or Namespace and tracks it
+        '''
+        api.add_model(model.name, model)
+        self.track(model, api)
+
+    def get_models(self, class_) -> list:
+        '''
+        Returns the tracked models derived from a mapped class
+        '''
+        with self._lock:
+            references = list(self._models.get(_class_key(class_), {}).values())
+        return [model for model in (reference() for reference in references) if model is not None]
+
+    def mark_changed(self, class_):
+        '''
+        Marks the models derived from class_ for regeneration on the next refresh
+        '''
+        with self._lock:
+            key = _class_key(class_)
+            self._classes[key] = class_
+            self._dirty.add(key)
+
+    def refresh(self) -> list:
+        '''
+        Regenerates the models derived from the classes changed since the last refresh
+        :returns: the regenerated models
+        '''
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+            models = {}
+            for key in dirty:
+                for reference in self._models.get(key, {}).values():
+                    model = reference()
+                    if model is not None:
+                        models[id(model)] = model
+
+            changed = [self._classes[key] for key in dirty if key in self._classes]
+            self._clear_shared_models(models.values(), changed)
+            for model in models.values():
+                self._regenerate(model)
+        return list(models.values())
+
+    def regenerate(self, model):
+        '''
+        Converts the class of a generated model again with the options it was generated with,
+        replaces its fields in place and registers it and its nested models again.
+        '''
+        if getattr(model, "__sqla_options__", None) is None:
+            raise ValueError("Model {} has no conversion options and can't be regenerated.".format(model.name))
+        with self._lock:
+            self._clear_shared_models([model], get_model_dependencies(model))
+            self._regenerate(model)
+
+    def _clear_shared_models(self, models, classes):
+        '''
+        drops the shared nested models of classes, and those nesting them, from the converters of models
+        '''
+        converters = set(
+            model.__sqla_options__["model_converter"] for model in models
+            if isinstance(model.__sqla_options__["model_converter"], type)
+        )
+        for model_converter in converters:
+            for class_ in classes:
+                model_converter.clear_shared_models(class_, dependents=True)
+
+    def _regenerate(self, model):
+        options = model.__sqla_options__
+        class_ = self._classes.get(_class_key(model.__sqla_model__), model.__sqla_model__)
+        model_fields = SQLAlchemyToRestPlusMeta.get_fields_from_sqlalchemy(
+            class_,
+            options["model_converter"],
+            declared_fields=options["declared_fields"],
+            only=options["only"],
+            exclude=options["exclude"],
+            include_relationships=options["include_relationships"],
+            nested_depth=options["nested_depth"],
+        )
+        model_fields.update(options["declared_fields"])
+
+        model.clear()
+        model.update(model_fields)
+        model.__sqla_model__ = class_
+        self.track(model)
+        for api in self._apis.get(id(model), []):
+            api.add_model(model.name, model)
+            # shared nested models were converted again under the same names
+            register_nested_models(api, model, replace=True)
+
+    def _listen_attributes(self, class_):
+        if class_ in _instrumented_classes:
+            return
+        _instrumented_classes.add(class_)
+        event.listen(class_, "attribute_instrument", _on_attribute_instrument)
+
+    def _on_attribute_instrument(self, class_, key, inst):
+        # called while the property is being set up, regenerated on the next refresh
+        with self._lock:
+            if _class_key(class_) in self._models:
+                self.mark_changed(class_)
+
+    def _on_mapper_configured(self, mapper, class_):
+        with self._lock:
+            if _class_key(class_) in self._models:
+                self.mark_changed(class_)
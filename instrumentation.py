@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import copy
+import threading
+
+
+class Instrumentation():
+    '''
+    Collects timings and counters of the conversion and schema hot paths.
+    Disabled by default, code paths check `enabled` before measuring anything.
+
+    Events recorded:
+    model_conversion: key is the mapped class name, timed (SQLAlchemyModelConverter.fields_for_model)
+    model_construction: key is the model name, timed (SQLAlchemyToRestPlusMeta)
+    type_resolution: key is the SQLA type name, timed, data path is cache, mro, python_type or impl
+    validation: key is the model name, timed (json.dumps of the schema)
+    cache: key is the cache name, data result is hit or miss
+
+    Hooks are called as hook(event, key, duration, data) for every recorded event.
+    '''
+    def __init__(self):
+        self.enabled = False
+        self._hooks = []
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def add_hook(self, hook):
+        '''
+        adds a callback hook(event, key, duration, data)
+        '''
+        self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook):
+        self._hooks = [registered for registered in self._hooks if registered is not hook]
+
+    def record(self, event: str, key: str, duration: float = None, **data):
+        '''
+        adds an event to the stats and passes it to the hooks
+        :param event: event name
+        :param key: what the event is about (model name, type name, cache name)
+        :param duration: time spent in seconds, if timed
+        :param data: categorical values, counted per value
+        '''
+        with self._lock:
+            entry = self._stats.setdefault(event, {}).setdefault(key, {"count": 0, "total": 0.0})
+            entry["count"] += 1
+            if duration is not None:
+                entry["total"] += duration
+            for (name, value) in data.items():
+                counts = entry.setdefault(name, {})
+                counts[value] = counts.get(value, 0) + 1
+        for hook in self._hooks:
+            hook(event, key, duration, data)
+
+    def stats(self) -> dict:
+        '''
+        returns a snapshot of the recorded stats: {event: {key: {"count", "total", data name: {value: count}}}}
+        '''
+        with self._lock:
+            return copy.deepcopy(self._stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+# process wide instrumentation used by the converter and the models
+instrumentation = Instrumentation()
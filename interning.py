@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from collections import OrderedDict
+
+from flask_restplus import fields
+
+from .cache import freeze
+
+
+def _field_size(field) -> int:
+    size = sys.getsizeof(field) + sys.getsizeof(getattr(field, "__dict__", {}))
+    container = getattr(field, "container", None)
+    if isinstance(container, fields.Raw):
+        size += _field_size(container)
+    return size
+
+
+class FieldInterner():
+    '''
+    Shares one field instance between identical field definitions (field class and kwargs).
+    Kwargs are compared by content, fields nested in a model are only shared when they use the
+    same model instance, so nested placeholders are never shared.
+    Keeps the maxsize most recently used fields, like ConversionCache.
+
+    To enable it for a converter class:
+    SQLAlchemyModelConverter.interner = FieldInterner()
+    :param maxsize: maximum number of fields kept, None for unbounded
+    '''
+    def __init__(self, maxsize: int = 4096):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("`maxsize` must be a positive integer or None.")
+        self.maxsize = maxsize
+        self._fields = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def __len__(self):
+        return len(self._fields)
+
+    def get(self, field_class, field_kwargs: dict) -> fields.Raw:
+        '''
+        returns the field instance for field_class(**field_kwargs), creating it if needed
+        '''
+        try:
+            key = (field_class, freeze(field_kwargs))
+        except TypeError:
+            # kwargs that can't be ordered, not shared
+            with self._lock:
+                self.requests += 1
+            return field_class(**field_kwargs)
+
+        with self._lock:
+            self.requests += 1
+            entry = self._fields.get(key)
+            if entry is not None:
+                self._fields.move_to_end(key)
+                self.hits += 1
+                self.bytes_saved += entry[2]
+                return entry[0]
+
+            field = field_class(**field_kwargs)
+            # the kwargs are kept alive with the entry so the identities in the key can't be reused
+            self._fields[key] = (field, field_kwargs, _field_size(field))
+            if self.maxsize is not None and len(self._fields) > self.maxsize:
+                self._fields.popitem(last=False)
+            return field
+
+    def stats(self) -> dict:
+        '''
+        returns the number of unique fields, requested fields, shared fields and
+        an estimate of the bytes saved by sharing
+        '''
+        with self._lock:
+            return {
+                "fields": len(self._fields),
+                "requests": self.requests,
+                "hits": self.hits,
+                "bytes_saved": self.bytes_saved,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._fields = OrderedDict()
+            self.requests = self.hits = self.bytes_saved = 0
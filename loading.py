@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy.orm import class_mapper, joinedload, load_only, selectinload
+from sqlalchemy.orm.properties import ColumnProperty
+from sqlalchemy.orm.relationships import RelationshipProperty
+
+from .fields import get_primary_keys
+
+
+def get_mapped_class(model):
+    '''
+    Returns the SQLAlchemy class a model was generated from
+    :param model: a model generated by SQLAlchemyToRestPlus
+    '''
+    class_ = getattr(model, "__sqla_model__", None)
+    if class_ is None:
+        raise ValueError("`model` was not generated from a SQLAlchemy model.")
+    return class_
+
+
+def iter_model_properties(model, class_):
+    '''
+    yields (key, field, prop) for the fields of model backed by a property of class_.
+    fields are matched by their attribute, or their key when they have none.
+    '''
+    mapper = class_mapper(class_)
+    for (key, field) in model.items():
+        attribute = getattr(field, "attribute", None)
+        name = attribute if isinstance(attribute, str) else key
+        if mapper.has_property(name):
+            yield (key, field, mapper.get_property(name))
+
+
+def _get_nested_model(field):
+    nested_field = field if hasattr(field, "model") else getattr(field, "container", None)
+    return getattr(nested_field, "nested", None)
+
+
+def _get_loader_options(model, class_, depth):
+    mapper = class_mapper(class_)
+    columns = set()
+    options = []
+
+    for (key, field, prop) in iter_model_properties(model or {}, class_):
+        if type(prop) is ColumnProperty:
+            columns.add(prop.key)
+        elif type(prop) is RelationshipProperty:
+            # columns the relationship is loaded by, kept past max_depth too: the relationship
+            # is still marshalled with its default loader and a deferred key would cost a query
+            for column in prop.local_columns:
+                columns.add(mapper.get_property_by_column(column).key)
+            if depth <= 0:
+                continue
+            attr = getattr(class_, prop.key)
+            loader = selectinload(attr) if prop.uselist else joinedload(attr)
+            child_options = _get_loader_options(_get_nested_model(field), prop.mapper.class_, depth - 1)
+            if child_options:
+                loader = loader.options(*child_options)
+            options.append(loader)
+
+    if not columns:
+        columns = [prop.key for prop in get_primary_keys(class_)]
+    options.insert(0, load_only(*[getattr(class_, key) for key in sorted(columns)]))
+    return options
+
+
+def get_loader_options(model, max_depth: int = 2) -> list:
+    '''
+    Returns the query loader options that load what marshalling model reads:
+    load_only for the mapped columns of the model, and eager loading for nested
+    relationships (selectinload for collections, joinedload otherwise), recursively.
+    query.options(*get_loader_options(model))
+    :param model: a model generated by SQLAlchemyToRestPlus
+    :param max_depth: number of relationship levels to eager load, deeper relationships keep their default loader
+    '''
+    return _get_loader_options(model, get_mapped_class(model), max_depth)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+from flask_restplus import fields, inputs, marshal
+
+from .fields import Enum, UUID
+
+# formatters of the field classes whose format() can be inlined, {} is the value
+# only exact classes are listed, subclasses may override format()
+# each one must return what format() returns, boolean is flask_restplus.inputs.boolean
+INLINE_FORMATS = {
+    fields.Raw: "{}",
+    fields.String: "str({})",
+    Enum: "str({})",
+    UUID: "str({})",
+    fields.Integer: "int({})",
+    fields.Float: "float({})",
+    fields.Boolean: "boolean({})",
+}
+
+
+def _make_field(value):
+    '''
+    same as flask_restplus.fields make, field classes are instantiated
+    '''
+    if isinstance(value, type) and issubclass(value, fields.Raw):
+        return value()
+    return value
+
+
+def _is_simple_key(key) -> bool:
+    return isinstance(key, str) and "." not in key and not key.isdigit()
+
+
+def _can_inline(field) -> bool:
+    return (
+        type(field) in INLINE_FORMATS
+        and field.attribute is None
+        and not getattr(field, "mask", None)
+        and field.default is None
+    )
+
+
+def _can_compile_nested(field) -> bool:
+    return (
+        type(field) is fields.Nested
+        and field.attribute is None
+        and not getattr(field, "skip_none", False)
+    )
+
+
+def _marshal_nested(field, value):
+    return get_marshaller(field.nested)(value)
+
+
+def _generate(model, model_fields, getters, sources: dict, head: list, tail: list, namespace: dict):
+    '''
+    Generates and compiles the marshal_row function of model_fields plus head/tail lines.
+    :param getters: field key -> expression reading the value of the field from obj
+    :param sources: field key -> expression passed to output() of the fields that aren't inlined
+    '''
+    lines = ["def marshal_row(obj):"] + head + ["    out = {}"]
+    for (index, (key, field)) in enumerate(model_fields.items()):
+        field = _make_field(field)
+        name = "f{}".format(index)
+        namespace[name] = field
+        getter = getters.get(key)
+        source = sources[key]
+        if getter is not None and _can_inline(field):
+            lines += [
+                "    value = {}".format(getter),
+                "    out[{!r}] = None if value is None else {}".format(key, INLINE_FORMATS[type(field)].format("value")),
+            ]
+        elif getter is not None and _can_compile_nested(field):
+            lines += [
+                "    value = {}".format(getter),
+                "    if value is None:",
+                "        out[{0!r}] = {1}.output({0!r}, {2})".format(key, name, source),
+                "    else:",
+                "        out[{!r}] = marshal_nested({}, value)".format(key, name),
+            ]
+        else:
+            lines.append("    out[{0!r}] = {1}.output({0!r}, {2})".format(key, name, source))
+    lines += ["    return out", ""] + tail
+
+    namespace["marshal_nested"] = _marshal_nested
+    namespace["boolean"] = inputs.boolean
+    exec(compile("\n".join(lines), "<marshaller {}>".format(getattr(model, "name", "")), "exec"), namespace)
+    return namespace["marshaller"]
+
+
+def compile_marshaller(model):
+    '''
+    Generates a marshal function specialized for the fields of model.
+    The function takes the same arguments as flask_restplus.marshal and returns the same output.
+    Plain objects are read with inlined attribute getters and formatters, anything the
+    generated code doesn't handle (dicts, envelopes, masks, skip_none, ordered output,
+    errors) is passed on to flask_restplus.marshal.
+    :param model: the restplus model
+    '''
+    def generic(data, envelope=None, skip_none=False, mask=None, ordered=False):
+        return marshal(data, model, envelope=envelope, skip_none=skip_none, mask=mask, ordered=ordered)
+
+    model_fields = getattr(model, "resolved", model)
+    if getattr(model, "__mask__", None) or any(
+        isinstance(field, getattr(fields, "Wildcard", ())) for field in model_fields.values()
+    ):
+        return generic
+
+    getters = {
+        key: "getattr(obj, {!r}, None)".format(key)
+        for (key, field) in model_fields.items()
+        if _is_simple_key(key)
+    }
+    head = [
+        "    if isinstance(obj, (list, tuple)):",
+        "        return [marshal_row(item) for item in obj]",
+        "    if hasattr(obj, '__iter__'):",
+        "        return generic(obj)",
+    ]
+    tail = [
+        "def marshaller(data, envelope=None, skip_none=False, mask=None, ordered=False):",
+        "    if envelope or skip_none or mask or ordered:",
+        "        return generic(data, envelope, skip_none, mask, ordered)",
+        "    try:",
+        "        return marshal_row(data)",
+        "    except Exception:",
+        "        # let marshal raise the same error it would have raised",
+        "        return generic(data)",
+    ]
+    sources = dict.fromkeys(model_fields, "obj")
+    return _generate(model, model_fields, getters, sources, head, tail, {"generic": generic})
+
+
+def compile_row_marshaller(model, keys):
+    '''
+    Generates a function marshalling SQLAlchemy Core rows (or tuples) with model.
+    The value of each field is read by position, keys are the field keys in the order of
+    the row columns. Fields not in keys are output as if their attribute was missing.
+    Takes a row or a list of rows, the output is the same as marshal of dicts holding the
+    row values; errors are raised by flask_restplus.marshal.
+    :param model: the restplus model
+    :param keys: field keys of the row columns
+    '''
+    keys = tuple(keys)
+
+    def generic(data):
+        if isinstance(data, list):
+            return marshal([dict(zip(keys, row)) for row in data], model)
+        return marshal(dict(zip(keys, data)), model)
+
+    model_fields = getattr(model, "resolved", model)
+    if getattr(model, "__mask__", None) or any(
+        isinstance(field, getattr(fields, "Wildcard", ())) for field in model_fields.values()
+    ):
+        return generic
+
+    positions = {key: index for (index, key) in enumerate(keys)}
+    getters = {
+        key: "obj[{}]".format(positions[key])
+        for key in model_fields
+        if key in positions
+    }
+    head = [
+        "    if isinstance(obj, list):",
+        "        return [marshal_row(item) for item in obj]",
+    ]
+    tail = [
+        "def marshaller(data):",
+        "    try:",
+        "        return marshal_row(data)",
+        "    except Exception:",
+        "        # let marshal raise the same error it would have raised",
+        "        return generic(data)",
+    ]
+    # fields that aren't inlined read the row value from a dict, like marshal of the row dict
+    sources = {
+        key: "{{{!r}: {}}}".format(key, getters[key]) if key in getters else "EMPTY"
+        for key in model_fields
+    }
+    return _generate(model, model_fields, getters, sources, head, tail, {"generic": generic, "EMPTY": {}})
+
+
+def get_marshaller(model):
+    '''
+    Returns the compiled marshal function of model, compiling it on first use
+    and again after the fields of the model changed.
+    :param model: the restplus model
+    '''
+    version = getattr(model, "_fields_version", None)
+    cached = model.__dict__.get("_compiled_marshaller")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    marshaller = compile_marshaller(model)
+    model._compiled_marshaller = (version, marshaller)
+    return marshaller
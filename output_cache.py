@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import uuid
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, class_mapper
+
+from .cache import LRUCache
+from .dependencies import get_model_dependencies
+from .fields import get_primary_keys
+from .marshalling import get_marshaller
+
+_PENDING_KEY = "flask_restplus_sqlalchemy.marshal_cache"
+
+
+class LocalBackend():
+    '''
+    In process backend, a bounded LRU mapping
+    :param maxsize: maximum number of cached rows
+    '''
+    def __init__(self, maxsize: int = 10000):
+        self._cache = LRUCache(maxsize)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class SharedBackend():
+    '''
+    Backend storing json values in a shared store through a client with get(key), set(key, value)
+    and delete(key), like redis.Redis or pymemcache clients. Bound the store with its own eviction policy.
+    :param client: the store client
+    :param prefix: prefix of the keys in the store
+    '''
+    def __init__(self, client, prefix: str = "marshal:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value, default=str, separators=(",", ":")))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class MarshalCache():
+    '''
+    Cache of marshalled rows keyed by (model, primary key), entries hold the version_id_col value
+    of the row when the mapper has one and are only used while it matches.
+    Each row also has a generation stored in the backend and part of the entry keys. Modifying or
+    deleting an instance replaces its generation after flush and again after commit (for rows cached
+    from other transactions in between), so processes sharing a backend invalidate each other's
+    entries without knowing which models they cached.
+    Only models without nested relationships are cached, changes of related rows aren't tracked.
+    The returned dicts are shared with the cache and must not be modified.
+
+    cache = MarshalCache(LocalBackend(maxsize=10000))
+    cache.listen(db.session)
+    cache.marshal(user, UsersModel)
+    '''
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else LocalBackend()
+
+    def listen(self, target=Session):
+        '''
+        invalidates entries on the flush and commit events of target, a Session, sessionmaker or scoped_session
+        '''
+        event.listen(target, "after_flush", self._after_flush)
+        event.listen(target, "after_commit", self._after_commit)
+        event.listen(target, "after_rollback", self._after_rollback)
+
+    @staticmethod
+    def _get_model_key(model):
+        '''
+        returns the model name and fingerprint of the fields of model, None if it can't be cached
+        '''
+        version = getattr(model, "_fields_version", None)
+        cached = model.__dict__.get("_marshal_cache_key")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        model_key = None
+        class_ = getattr(model, "__sqla_model__", None)
+        if class_ is not None and get_model_dependencies(model) == {class_}:
+            fields = [(key, type(field).__name__, getattr(field, "attribute", None)) for (key, field) in model.items()]
+            fingerprint = hashlib.sha1(json.dumps(fields, default=str).encode("utf-8")).hexdigest()
+            model_key = (model.name, fingerprint)
+        model._marshal_cache_key = (version, model_key)
+        return model_key
+
+    @staticmethod
+    def _row_id(instance, primary_key) -> str:
+        # instances of a polymorphic hierarchy share the id of their row
+        class_ = class_mapper(type(instance)).base_mapper.class_
+        return "{}.{}:{}".format(
+            class_.__module__, class_.__qualname__,
+            json.dumps(list(primary_key), default=str, separators=(",", ":")),
+        )
+
+    @staticmethod
+    def _get_version(instance):
+        mapper = class_mapper(type(instance))
+        if mapper.version_id_col is None:
+            return None
+        version = getattr(instance, mapper.get_property_by_column(mapper.version_id_col).key)
+        # compared as text, the same after a round trip through a json backend
+        return None if version is None else str(version)
+
+    def marshal_one(self, instance, model):
+        '''
+        returns the marshalled instance, from the cache when possible
+        '''
+        model_key = self._get_model_key(model)
+        if model_key is None:
+            return get_marshaller(model)(instance)
+        primary_key = [getattr(instance, prop.key) for prop in get_primary_keys(type(instance))]
+        if any(value is None for value in primary_key):
+            return get_marshaller(model)(instance)
+
+        row_id = self._row_id(instance, primary_key)
+        key = "row:{}:{}".format(model_key[0], row_id)
+        generation = self.backend.get("generation:" + row_id)
+        version = self._get_version(instance)
+        entry = self.backend.get(key)
+        if entry is not None and entry[0] == generation and entry[1] == model_key[1] and entry[2] == version:
+            return entry[3]
+        data = get_marshaller(model)(instance)
+        self.backend.set(key, [generation, model_key[1], version, data])
+        return data
+
+    def marshal(self, data, model):
+        '''
+        marshals an instance or a list of instances like flask_restplus.marshal(data, model)
+        '''
+        if isinstance(data, (list, tuple)):
+            return [self.marshal_one(instance, model) for instance in data]
+        return self.marshal_one(data, model)
+
+    def invalidate(self, instance):
+        '''
+        invalidates the entries of an instance for every model
+        '''
+        key = self._get_instance_key(instance)
+        if key is not None:
+            self._next_generation(key)
+
+    def _get_instance_key(self, instance):
+        primary_key = inspect(instance).identity
+        if primary_key is None:
+            return None
+        return "generation:" + self._row_id(instance, primary_key)
+
+    def _next_generation(self, key: str):
+        # random rather than incremented, concurrent invalidations can't restore an old generation
+        self.backend.set(key, uuid.uuid4().hex)
+
+    def _after_flush(self, session, flush_context):
+        keys = session.info.setdefault(_PENDING_KEY, set())
+        for instance in list(session.dirty) + list(session.deleted):
+            key = self._get_instance_key(instance)
+            if key is not None:
+                self._next_generation(key)
+                keys.add(key)
+
+    def _after_commit(self, session):
+        for key in session.info.pop(_PENDING_KEY, ()):
+            self._next_generation(key)
+
+    def _after_rollback(self, session):
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+import sqlalchemy as sa
+from flask_restplus import Model, fields
+from sqlalchemy.orm import class_mapper
+from sqlalchemy.orm.properties import ColumnProperty
+
+from .fields import get_primary_keys
+
+PAGE_MODEL_POSTFIX = "Page"
+
+
+def page_model(model, name: str = None) -> Model:
+    '''
+    Returns the envelope model of a page of model: items, next_cursor (null on the last page) and limit
+    :param model: the model of the items
+    :param name: the envelope model name (default model name + PAGE_MODEL_POSTFIX)
+    '''
+    return Model(name or model.name + PAGE_MODEL_POSTFIX, {
+        "items": fields.List(fields.Nested(model)),
+        "next_cursor": fields.String(description="cursor of the next page"),
+        "limit": fields.Integer(),
+    })
+
+
+def _get_order_properties(class_, order_by) -> list:
+    mapper = class_mapper(class_)
+    primary_keys = get_primary_keys(class_)
+    if order_by is None:
+        return primary_keys
+    props = []
+    for attribute in order_by:
+        prop = mapper.get_property(attribute if isinstance(attribute, str) else attribute.key)
+        if type(prop) is not ColumnProperty:
+            raise ValueError("Can only order pages by columns, {} is not one.".format(prop.key))
+        if prop.columns[0].nullable:
+            # NULLs can't be compared in the seek condition
+            raise ValueError("Can't order pages by {}, the column is nullable.".format(prop.key))
+        props.append(prop)
+    # the primary key makes the ordering unique
+    props.extend(prop for prop in primary_keys if prop not in props)
+    return props
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    return value
+
+
+def _decode_value(value, column):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if python_type is datetime.time:
+        return datetime.time.fromisoformat(value)
+    if python_type in (decimal.Decimal, uuid.UUID):
+        return python_type(value)
+    if python_type is bytes:
+        return base64.b64decode(value.encode("ascii"), validate=True)
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    '''
+    Returns the opaque cursor of the ordering values of the last item of a page
+    '''
+    data = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    '''
+    Returns the ordering values of a cursor, converted to the python types of columns
+    '''
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data.decode("utf-8"))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [_decode_value(value, column) for (value, column) in zip(values, columns)]
+    except (binascii.Error, UnicodeDecodeError, AttributeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor {!r}.".format(cursor))
+
+
+def _seek_condition(columns: list, values: list):
+    # (c1, c2, ...) > (v1, v2, ...) expanded, row value comparisons aren't portable
+    clauses = []
+    for index in range(len(columns)):
+        equal = [column == value for (column, value) in zip(columns[:index], values[:index])]
+        clauses.append(sa.and_(*(equal + [columns[index] > values[index]])))
+    # the leading range lets the database seek on the index of the first column
+    return sa.and_(columns[0] >= values[0], sa.or_(*clauses))
+
+
+def keyset_page(query, limit: int, cursor: str = None, order_by=None) -> dict:
+    '''
+    Returns a page of an ORM query with keyset (seek) pagination, in the format of page_model:
+    {"items": [...], "next_cursor": ..., "limit": limit}
+    Pages are selected with a condition on the ordering columns rather than OFFSET,
+    so every page costs the same with an index on them.
+    :param query: ORM query of a single mapped class, without ordering or limit
+    :param limit: items per page
+    :param cursor: next_cursor of the previous page, None for the first page
+    :param order_by: column attributes or property names of non nullable columns to order by
+                     (default the primary key), the primary key is appended to make the ordering unique
+    '''
+    if limit < 1:
+        raise ValueError("`limit` must be positive.")
+    class_ = query.column_descriptions[0]["entity"]
+    props = _get_order_properties(class_, order_by)
+    columns = [prop.columns[0] for prop in props]
+    attributes = [getattr(class_, prop.key) for prop in props]
+
+    if cursor is not None:
+        values = decode_cursor(cursor, columns)
+        if any(value is None for value in values):
+            raise ValueError("Invalid cursor {!r}.".format(cursor))
+        query = query.filter(_seek_condition(attributes, values))
+
+    items = query.order_by(*attributes).limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], prop.key) for prop in props])
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
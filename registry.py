@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from .cache import freeze
+from .schema import SQLAlchemyToRestPlus
+
+
+class _Build():
+    '''
+    a model construction in progress, other threads wait on event
+    '''
+    def __init__(self):
+        self.event = threading.Event()
+        self.model = None
+        self.error = None
+
+
+class ModelRegistry():
+    '''
+    Thread safe registry of generated models.
+    Models are looked up without locking. A model that doesn't exist yet is built by the first
+    thread asking for it while concurrent requests for the same name and options wait for that build.
+    '''
+    def __init__(self):
+        self._models = {}
+        self._names = {}
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    @staticmethod
+    def make_key(name: str, fields: dict, options: dict) -> tuple:
+        '''
+        builds the key of a model from its name, fields and options, compared by content
+        '''
+        return (
+            name,
+            freeze(fields or {}),
+            tuple(sorted(
+                # the order of only / exclude doesn't change the model
+                (option, freeze(set(value) if option in ("only", "exclude") and value else value))
+                for (option, value) in options.items()
+            )),
+        )
+
+    def get(self, name: str, fields: dict = None, api=None, **options):
+        '''
+        Returns the model created by SQLAlchemyToRestPlus(name, fields, **options), building it once.
+        :param name: model name, can only be used with one set of fields and options
+        :param fields: the extra fields of the model
+        :param api: Api or Namespace to register the model with
+        :param options: the SQLAlchemyToRestPlus options (model, only, exclude, ...)
+        '''
+        key = self.make_key(name, fields, options)
+        model = self._models.get(key)
+        if model is None:
+            model = self._build(key, name, fields, options)
+        if api is not None and api.models.get(name) is not model:
+            with self._lock:
+                if api.models.get(name) is not model:
+                    api.add_model(name, model)
+        return model
+
+    def _build(self, key, name, fields, options):
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                return model
+            if self._names.get(name, key) != key:
+                raise ValueError(
+                    "Model {} is already registered with other fields or options.".format(name)
+                )
+            build = self._building.get(key)
+            owner = build is None
+            if owner:
+                build = self._building[key] = _Build()
+                self._names[name] = key
+
+        if not owner:
+            build.event.wait()
+            if build.error is not None:
+                raise build.error
+            return build.model
+
+        try:
+            build.model = SQLAlchemyToRestPlus(name, dict(fields or {}), **options)
+        except BaseException as error:
+            build.error = error
+            raise
+        finally:
+            with self._lock:
+                if build.model is not None:
+                    self._models[key] = build.model
+                else:
+                    del self._names[name]
+                del self._building[key]
+            build.event.set()
+        return build.model
+
+    def clear(self):
+        with self._lock:
+            self._models = {}
+            self._names = {}
+
+
+# process wide registry
+registry = ModelRegistry()
+
+
+def get_model(name: str, fields: dict = None, api=None, **options):
+    '''
+    Returns a model from the process wide registry, see ModelRegistry.get
+    '''
+    return registry.get(name, fields, api=api, **options)
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 from .convert import SQLAlchemyModelConverter
-from flask_restplus import fields as rp_fields, Model, OrderedModel
+from .instrumentation import instrumentation
+from .validation import get_validator, UnsupportedSchema
+from time import perf_counter
+from flask_restplus import fields as rp_fields, Model, OrderedModel, abort
+from http import HTTPStatus
 import json
+import itertools
 from collections import OrderedDict, MutableMapping
 from abc import ABCMeta
 
@@ -12,6 +17,21 @@ def is_instance_or_subclass(val, class_):
     except TypeError:
         return isinstance(val, class_)
 
+# when the generated schema is checked for errors:
+# eager: on construction, deferred: on first schema access, off: never
+VALIDATION_MODES = ('eager', 'deferred', 'off')
+
+# source of SQLAlchemyToRestPlus field versions, increases on every change of any model
+_field_versions = itertools.count(1)
+_last_fields_version = 0
+
+
+def get_fields_generation() -> int:
+    '''
+    returns the version of the last change to the fields of any generated model
+    '''
+    return _last_fields_version
+
 class SQLAlchemyToRestPlusMeta(ABCMeta):
     def __call__(cls, name, *args, **kwargs):
         """
@@ -23,6 +43,10 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
             #model not supplied, use default
             return super(SQLAlchemyToRestPlusMeta, cls).__call__(name, *args, **kwargs)
 
+        instrumented = instrumentation.enabled
+        if instrumented:
+            start = perf_counter()
+
         if args:
             fields = args[0]
         else:
@@ -31,7 +55,14 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
         exclude = kwargs.pop('exclude', None)
         model_converter = kwargs.pop('model_converter', SQLAlchemyModelConverter)
         include_relationships = kwargs.pop('include_relationships', False)
+        nested_depth = kwargs.pop('nested_depth', None)
+        if nested_depth is not None:
+            include_relationships = True
         sorted = kwargs.pop('sorted', True)
+        cache = kwargs.pop('cache', getattr(cls, 'conversion_cache', None))
+        if cache is False or not isinstance(model_converter, type):
+            # converter instances carry state (nested_models) the cache can't key on
+            cache = None
         
         if only and not isinstance(only, (list, set)):
             raise ValueError("`only` option must be a list or set.")
@@ -47,8 +78,19 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
 
         dict_cls = dict
         declared_fields = SQLAlchemyToRestPlusMeta.get_declared_fields(fields)
-        schema_fields = SQLAlchemyToRestPlusMeta.get_fields_from_sqlalchemy(model, model_converter, declared_fields=declared_fields, only=only, exclude=exclude, dict_cls=dict_cls, include_relationships=include_relationships)
-        schema_fields.update(declared_fields)
+
+        schema_fields = None
+        if cache is not None:
+            cache_key = cache.make_key(model, model_converter, only, exclude, include_relationships, declared_fields, nested_depth)
+            schema_fields = cache.get_fields(cache_key, dict_cls=dict_cls)
+            if instrumented:
+                instrumentation.record("cache", "conversion", result="miss" if schema_fields is None else "hit")
+
+        if schema_fields is None:
+            schema_fields = SQLAlchemyToRestPlusMeta.get_fields_from_sqlalchemy(model, model_converter, declared_fields=declared_fields, only=only, exclude=exclude, dict_cls=dict_cls, include_relationships=include_relationships, nested_depth=nested_depth)
+            schema_fields.update(declared_fields)
+            if cache is not None:
+                cache.set_fields(cache_key, declared_fields, schema_fields)
 
         args = (schema_fields,) + args[1:] or None
         
@@ -57,6 +99,20 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
         else:
             instance = super(SQLAlchemyToRestPlusMeta, cls).__call__(name, *args, **kwargs)
 
+        instance.__sqla_model__ = model
+        instance.__sqla_options__ = {
+            'declared_fields': declared_fields,
+            'model_converter': model_converter,
+            'only': only,
+            'exclude': exclude,
+            'include_relationships': include_relationships,
+            'nested_depth': nested_depth,
+        }
+        model_index = getattr(cls, 'model_index', None)
+        if model_index is not None:
+            model_index.track(instance)
+        if instrumented:
+            instrumentation.record("model_construction", name, perf_counter() - start)
         return instance
     
 
@@ -85,6 +141,7 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
         exclude=None,
         dict_cls=dict,
         include_relationships=False,
+        nested_depth=None,
         ) -> dict:
         """
         creates an instance of the converter and generates the fields for the model
@@ -93,7 +150,14 @@ class SQLAlchemyToRestPlusMeta(ABCMeta):
         if exclude is not None:
             exclude = set(exclude)
 
-        converter = model_converter()
+        if isinstance(model_converter, type):
+            if nested_depth is not None:
+                converter = model_converter(nested_depth=nested_depth)
+            else:
+                converter = model_converter()
+        else:
+            # a converter instance shared by several conversions
+            converter = model_converter
 
         model_fields = converter.fields_for_model(
             model,
@@ -110,28 +174,132 @@ class SQLAlchemyToRestPlus(Model, metaclass=SQLAlchemyToRestPlusMeta):
     A restplus model that utilizes a metaclass to generate the restplus model from a SQLAlchemy model
     :param fields: the first argument must be the extra fields to include in the model
     :param model: the SQLAlchemy model
-    :param model_converter: the model converter to use (default SQLAlchemyModelConverter)
+    :param model_converter: the model converter class or instance to use (default SQLAlchemyModelConverter)
     :param only: only include specified fields
     :param exclude: exclude specified fields
     :param include_relationships: include relationship properties
+    :param nested_depth: nest relationships as shared models of their target this many levels deep,
+                         deeper ones, those of a class to itself and back references as primary key models
+                         (implies include_relationships)
     :param sorted: sort the model properties
+    :param cache: a ConversionCache to reuse generated fields from, False to disable (default conversion_cache)
+    :param validation: when to check the generated schema, one of VALIDATION_MODES (default validation)
     '''
+    # opt-in ConversionCache shared by all conversions, None disables caching
+    conversion_cache = None
+
+    # opt-in ModelIndex tracking generated models for regeneration, None disables tracking
+    model_index = None
+
+    # default validation mode, see VALIDATION_MODES
+    validation = 'eager'
+
+    # validate payloads (@api.expect(model, validate=True)) with a validator compiled from the fields
+    # instead of jsonschema, models the compiler doesn't support still use jsonschema
+    compile_validators = False
+
+    # changes whenever fields are added, replaced or removed
+    _fields_version = 0
+
+    # the SQLAlchemy class the model was generated from
+    __sqla_model__ = None
+
+    # the conversion options the model was generated with
+    __sqla_options__ = None
+
     def __init__(self, name, *args, **kwargs):
+        validation = kwargs.pop('validation', self.validation)
+        if validation not in VALIDATION_MODES:
+            raise ValueError(
+                "`validation` option must be one of {}.".format(", ".join(VALIDATION_MODES))
+            )
         super().__init__(name, *args, **kwargs)
-        # do this to throw exception if model is broken
-        json.dumps(self.__schema__)
-        #print(jdump)
+        self._validation_pending = validation == 'deferred'
+        if validation == 'eager':
+            # do this to throw exception if model is broken
+            self._validate_schema(self.__schema__)
+
+    @property
+    def __schema__(self):
+        schema = super().__schema__
+        if self._validation_pending:
+            self._validate_schema(schema)
+            self._validation_pending = False
+        return schema
+
+    def _validate_schema(self, schema):
+        if not instrumentation.enabled:
+            json.dumps(schema)
+            return
+        start = perf_counter()
+        json.dumps(schema)
+        instrumentation.record("validation", self.name, perf_counter() - start)
+
+    def validate(self, data, resolver=None, format_checker=None):
+        validator = get_validator(self) if self.compile_validators else None
+        if validator is not None:
+            try:
+                errors = validator(data, format_checker, resolver)
+            except UnsupportedSchema:
+                pass
+            else:
+                if errors:
+                    abort(HTTPStatus.BAD_REQUEST, message='Input payload validation failed', errors=errors)
+                return
+        super().validate(data, resolver=resolver, format_checker=format_checker)
+
+    def _fields_changed(self):
+        global _last_fields_version
+        self._fields_version = _last_fields_version = next(_field_versions)
+        # resolved is a cached copy of the fields, marshal and the compiled marshallers read it
+        self.__dict__.pop("resolved", None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._fields_changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._fields_changed()
+
+    def clear(self):
+        super().clear()
+        self._fields_changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._fields_changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._fields_changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._fields_changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._fields_changed()
 
 class SortedSQLAlchemyToRestPlus(SQLAlchemyToRestPlus):
     '''
     A model that sorts the properties
+    The sorted schema is kept until the fields of the model change.
 
     :param str name: The model public name
     :param str mask: an optional default model mask
     '''
     @property
     def _schema(self):
+        cached = self.__dict__.get('_sorted_schema')
+        if cached is not None and cached[0] == self._fields_version:
+            return cached[1]
         schema = super(SortedSQLAlchemyToRestPlus, self)._schema
         if 'properties' in schema:
             schema['properties'] = dict(sorted(schema['properties'].items()))
-        return schema
\ No newline at end of file
+        self._sorted_schema = (self._fields_version, schema)
+        return schema
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import json
+
+from flask import Response, stream_with_context
+
+from .marshalling import get_marshaller
+
+
+def iter_json(query, model, batch_size: int = 1000, envelope: str = None, dumps=json.dumps):
+    '''
+    Marshals the rows of query with model batch by batch and yields the chunks of a json array,
+    so memory use doesn't grow with the number of rows.
+    :param query: a SQLAlchemy Query (read with yield_per) or any iterable of rows
+    :param model: the restplus model to marshal the rows with
+    :param batch_size: number of rows fetched and marshalled at a time
+    :param envelope: optional key to wrap the array in an object
+    :param dumps: function serializing a list to json
+    '''
+    if batch_size <= 0:
+        raise ValueError("`batch_size` must be a positive integer.")
+
+    marshaller = get_marshaller(model)
+    if hasattr(query, "yield_per"):
+        query = query.yield_per(batch_size)
+
+    yield "{{{}:[".format(dumps(envelope)) if envelope else "["
+
+    separator = ""
+    batch = []
+    for row in query:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield separator + dumps(marshaller(batch))[1:-1]
+            separator = ","
+            batch = []
+    if batch:
+        yield separator + dumps(marshaller(batch))[1:-1]
+
+    yield "]}" if envelope else "]"
+
+
+def streaming_response(query, model, batch_size: int = 1000, envelope: str = None, dumps=json.dumps, **kwargs) -> Response:
+    '''
+    Returns a flask Response streaming the rows of query marshalled with model as json.
+    Takes the arguments of iter_json, any other keyword argument is passed on to Response.
+    '''
+    kwargs.setdefault("mimetype", "application/json")
+    return Response(
+        stream_with_context(iter_json(query, model, batch_size=batch_size, envelope=envelope, dumps=dumps)),
+        **kwargs
+    )
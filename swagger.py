@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import io
+import json
+import threading
+
+from flask import Response, request
+from flask_restplus.swagger import Swagger
+
+from .schema import get_fields_generation
+
+
+def _compress(data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    # no timestamp, the same document always compresses to the same bytes
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gzip_file:
+        gzip_file.write(data)
+    return buffer.getvalue()
+
+
+class SwaggerCache():
+    '''
+    Serves the swagger.json of an Api built once, serialized and gzipped ahead of time with strong ETags.
+    The document is built again when the fields of a generated model change or models, resources
+    or namespaces are added. Conditional requests matching the ETag get a 304.
+
+    cache = SwaggerCache(api)
+    cache.install(app)
+    '''
+    def __init__(self, api):
+        self.api = api
+        self._token = None
+        self._document = None
+        self._lock = threading.Lock()
+
+    def get_token(self) -> tuple:
+        '''
+        returns the state the document is built from, it is built again when this changes
+        '''
+        api = self.api
+        return (get_fields_generation(), len(api.models), len(api.resources), len(api.namespaces))
+
+    def get_document(self) -> tuple:
+        '''
+        returns (etag, body, gzipped body) of the current document, building it if needed.
+        needs a request context like api.__schema__.
+        '''
+        token = self.get_token()
+        document = self._document
+        if document is not None and self._token == token:
+            return document
+        with self._lock:
+            if self._document is None or self._token != token:
+                schema = Swagger(self.api).as_dict()
+                # the Api caches the first schema it builds, keep its own copy and ref resolver current
+                self.api._schema = schema
+                self.api.__dict__.pop("__schema__", None)
+                self.api._refresolver = None
+                body = json.dumps(schema, separators=(",", ":")).encode("utf-8")
+                etag = hashlib.sha256(body).hexdigest()
+                self._document = (etag, body, _compress(body))
+                self._token = token
+            return self._document
+
+    def clear(self):
+        with self._lock:
+            self._document = None
+            self._token = None
+
+    def response(self) -> Response:
+        '''
+        returns the response to the current request for the swagger.json
+        '''
+        (etag, body, gzipped) = self.get_document()
+        use_gzip = request.accept_encodings["gzip"] > 0
+        # the gzipped representation has its own strong etag
+        current_etag = etag + "-gzip" if use_gzip else etag
+        if request.if_none_match.contains(etag) or request.if_none_match.contains(etag + "-gzip"):
+            response = Response(status=304)
+        else:
+            response = Response(gzipped if use_gzip else body, mimetype="application/json")
+            if use_gzip:
+                response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(current_etag)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def install(self, app=None):
+        '''
+        replaces the swagger.json view of the Api with the cached document
+        :param app: the flask app the Api (or its blueprint) is registered with (default api.app)
+        '''
+        app = app or self.api.app
+        endpoint = self.api.endpoint("specs")
+        if endpoint not in app.view_functions:
+            raise ValueError("The Api has no swagger.json endpoint {} registered on app.".format(endpoint))
+        app.view_functions[endpoint] = lambda *args, **kwargs: self.response()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import importlib.util
+import os
+import sys
+
+import pytest
+from flask import Flask
+from flask_restplus import Api
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "flask_restplus_sqlalchemy"
+
+# the checkout is the package itself, import it under its package name
+if PACKAGE not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture
+def api(app):
+    return Api(app)
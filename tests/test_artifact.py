@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+import sqlalchemy as sa
+from flask_restplus import marshal
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from flask_restplus_sqlalchemy import (
+    SQLAlchemyModelConverter,
+    build_artifact,
+    convert_all,
+    get_loader_options,
+    load_models,
+)
+
+Base = declarative_base()
+
+
+class Group(Base):
+    __tablename__ = "artifact_group"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20), nullable=False)
+    kind = sa.Column(sa.Enum("staff", "guest", name="kind"))
+    users = relationship("User", back_populates="group")
+
+
+class User(Base):
+    __tablename__ = "artifact_user"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    group_id = sa.Column(sa.Integer, sa.ForeignKey("artifact_group.id"))
+    group = relationship("Group", back_populates="users")
+
+
+@pytest.fixture
+def path(tmp_path):
+    SQLAlchemyModelConverter.clear_shared_models()
+    path = str(tmp_path / "models.json")
+    build_artifact(Base, path)
+    return path
+
+
+def _schemas(models):
+    return {model.name: model.__schema__ for model in models.values()}
+
+
+def test_round_trip(path):
+    loaded = load_models(Base, path)
+    converted = convert_all(Base)
+    assert list(loaded) == list(converted)
+    assert _schemas(loaded) == _schemas(converted)
+
+    group = Group(id=1, name="staff", kind="staff")
+    user = User(id=2, name="bob", group=group)
+    assert marshal(user, loaded[User]) == marshal(user, converted[User])
+    assert marshal(group, loaded[Group]) == marshal(group, converted[Group])
+    assert marshal(user, loaded[User])["group"] == {"id": 1, "name": "staff", "kind": "staff", "users": [{"id": 2}]}
+
+
+def test_loaded_models_are_not_converted(path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("converted")
+    monkeypatch.setattr(SQLAlchemyModelConverter, "fields_for_model", fail)
+    models = load_models(Base, path)
+    assert set(models) == {Group, User}
+
+
+def test_restores_model_attributes(path):
+    models = load_models(Base, path)
+    converted = convert_all(Base)
+    for (class_, model) in models.items():
+        assert model.__sqla_model__ is class_
+        options = dict(converted[class_].__sqla_options__)
+        options["model_converter"] = SQLAlchemyModelConverter
+        assert model.__sqla_options__ == options
+    assert models[User]["group"].model.__sqla_model__ is Group
+    # helpers reading __sqla_model__ work on loaded models
+    assert get_loader_options(models[User], 1)
+
+
+def test_registers_models(path, api):
+    models = load_models(Base, path, api)
+    assert api.models["UserModel"] is models[User]
+    assert api.models["GroupNested0Model"] is models[User]["group"].model
+
+
+@pytest.mark.parametrize("change", [
+    lambda artifact: artifact.update(hash="other"),
+    lambda artifact: artifact.update(format=0),
+    lambda artifact: artifact.update(version="2"),
+], ids=["hash", "format", "version"])
+def test_falls_back_to_convert_all(path, monkeypatch, change):
+    with open(path) as artifact_file:
+        artifact = json.load(artifact_file)
+    change(artifact)
+    with open(path, "w") as artifact_file:
+        json.dump(artifact, artifact_file)
+
+    calls = []
+    monkeypatch.setattr("flask_restplus_sqlalchemy.artifact.convert_all", lambda *args, **kwargs: calls.append(args))
+    load_models(Base, path)
+    assert calls
+
+
+def test_falls_back_without_artifact(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr("flask_restplus_sqlalchemy.artifact.convert_all", lambda *args, **kwargs: calls.append(args))
+    load_models(Base, str(tmp_path / "missing.json"))
+    with open(str(tmp_path / "broken.json"), "w") as artifact_file:
+        artifact_file.write("{")
+    load_models(Base, str(tmp_path / "broken.json"))
+    assert len(calls) == 2
+
+
+def test_version_and_options_in_key(tmp_path, monkeypatch):
+    path = str(tmp_path / "models.json")
+    build_artifact(Base, path, version="7")
+    calls = []
+    monkeypatch.setattr("flask_restplus_sqlalchemy.artifact.convert_all", lambda *args, **kwargs: calls.append(args))
+    load_models(Base, path, version="7")
+    assert not calls
+    load_models(Base, path, version="8")
+    load_models(Base, path, version="7", nested_depth=2)
+    assert len(calls) == 2
+
+
+def test_new_column_changes_key(tmp_path, monkeypatch):
+    base = declarative_base()
+
+    class Item(base):
+        __tablename__ = "artifact_item"
+
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    path = str(tmp_path / "models.json")
+    build_artifact(base, path)
+    Item.__table__.append_column(sa.Column("label", sa.String(10)))
+    Item.__mapper__.add_property("label", Item.__table__.c.label)
+
+    calls = []
+    monkeypatch.setattr("flask_restplus_sqlalchemy.artifact.convert_all", lambda *args, **kwargs: calls.append(args))
+    load_models(base, path)
+    assert calls
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import pytest
+import sqlalchemy as sa
+from flask_restplus import Model, fields, marshal
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from flask_restplus_sqlalchemy import SQLAlchemyModelConverter, SQLAlchemyToRestPlus, convert_all
+from flask_restplus_sqlalchemy.bulk import get_dependency_order, get_mapped_classes, link_nested_models
+
+Base = declarative_base()
+
+
+class Group(Base):
+    __tablename__ = "bulk_group"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    users = relationship("User", back_populates="group")
+
+
+class User(Base):
+    __tablename__ = "bulk_user"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    group_id = sa.Column(sa.Integer, sa.ForeignKey("bulk_group.id"))
+    group = relationship("Group", back_populates="users")
+    badges = relationship("Badge")
+
+
+class Badge(Base):
+    __tablename__ = "bulk_badge"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    user_id = sa.Column(sa.Integer, sa.ForeignKey("bulk_user.id"))
+    label = sa.Column(sa.String(20))
+
+
+@pytest.fixture(autouse=True)
+def shared_models():
+    SQLAlchemyModelConverter.clear_shared_models()
+    yield
+    SQLAlchemyModelConverter.clear_shared_models()
+
+
+@pytest.fixture(params=["eager", "off"])
+def validation(request):
+    SQLAlchemyToRestPlus.validation = request.param
+    yield request.param
+    SQLAlchemyToRestPlus.validation = "eager"
+
+
+def _instances():
+    group = Group(id=1, name="staff")
+    alice = User(id=1, name="alice", group=group, badges=[Badge(id=1, label="gold")])
+    bob = User(id=2, name="bob", group=group)
+    return (group, alice, bob)
+
+
+def test_dependency_order():
+    classes = get_dependency_order(get_mapped_classes([Group, User, Badge]))
+    assert classes.index(Badge) < classes.index(User)
+    assert set(classes) == {Group, User, Badge}
+
+
+def test_converts_every_class(validation):
+    models = convert_all(Base)
+    assert set(models) == {Group, User, Badge}
+    assert models[User].name == "UserModel"
+
+
+def test_back_references_end_cycles(validation):
+    models = convert_all(Base)
+    (group, alice, bob) = _instances()
+
+    assert marshal(alice, models[User]) == {
+        "id": 1,
+        "name": "alice",
+        "group_id": None,
+        "group": {"id": 1, "name": "staff", "users": [{"id": 1}, {"id": 2}]},
+        "badges": [{"id": 1, "user_id": None, "label": "gold"}],
+    }
+    assert marshal(group, models[Group]) == {
+        "id": 1,
+        "name": "staff",
+        "users": [
+            {"id": 1, "name": "alice", "group_id": None, "group": {"id": 1}, "badges": [{"id": 1}]},
+            {"id": 2, "name": "bob", "group_id": None, "group": {"id": 1}, "badges": []},
+        ],
+    }
+
+
+def test_nested_depth(validation):
+    models = convert_all(Base, nested_depth=0)
+    (group, alice, bob) = _instances()
+    assert marshal(alice, models[User])["group"] == {"id": 1}
+    with pytest.raises(ValueError):
+        convert_all(Base, nested_depth=None)
+
+
+def test_without_relationships():
+    models = convert_all(Base, include_relationships=False)
+    assert "group" not in models[User]
+
+
+def test_registers_nested_models(api):
+    models = convert_all(Base, api)
+    for model in models.values():
+        assert api.models[model.name] is model
+    assert api.models["GroupNested0Model"] is models[User]["group"].model
+    assert "UserRefModel" in api.models
+
+
+def test_link_nested_models_drops_resolved():
+    target = Model("TargetModel", {"id": fields.Integer})
+    owner = SQLAlchemyToRestPlus("OwnerModel", {
+        "target": fields.Nested(Model("TargetModel", {})),
+        "targets": fields.List(fields.Nested(Model("TargetModel", {}))),
+    })
+    data = {"target": {"id": 1}, "targets": [{"id": 2}]}
+    assert marshal(data, owner) == {"target": {}, "targets": [{}]}
+
+    link_nested_models([owner, target])
+    assert owner["target"].model is target
+    assert owner["targets"].container.model is target
+    assert marshal(data, owner) == data
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import gc
+import weakref
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+
+from flask_restplus_sqlalchemy import ConversionCache, SQLAlchemyToRestPlus
+from flask_restplus_sqlalchemy.cache import LRUCache, _on_mapper_configured
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = "cache_note"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    text = sa.Column(sa.String(20))
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.cache_info() == (2, 1, 2)
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_reuses_fields():
+    cache = ConversionCache()
+    first = SQLAlchemyToRestPlus("NoteModel", {}, model=Note, cache=cache)
+    second = SQLAlchemyToRestPlus("NoteModel", {}, model=Note, cache=cache)
+    assert cache.hits == 1
+    assert second["text"] is first["text"]
+    SQLAlchemyToRestPlus("NoteTextModel", {}, model=Note, only=["text"], cache=cache)
+    assert cache.misses == 2
+
+
+def test_invalidated_when_mapper_changes():
+    base = declarative_base()
+
+    class Item(base):
+        __tablename__ = "cache_item"
+
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    cache = ConversionCache()
+    SQLAlchemyToRestPlus("ItemModel", {}, model=Item, cache=cache)
+    Item.__table__.append_column(sa.Column("label", sa.String(10)))
+    Item.__mapper__.add_property("label", Item.__table__.c.label)
+    assert "label" in SQLAlchemyToRestPlus("ItemModel", {}, model=Item, cache=cache)
+
+
+def test_invalidated_when_mapper_configured():
+    cache = ConversionCache()
+    SQLAlchemyToRestPlus("NoteModel", {}, model=Note, cache=cache)
+    _on_mapper_configured(Note.__mapper__, Note)
+    assert len(cache) == 0
+
+    SQLAlchemyToRestPlus("NoteModel", {}, model=Note, cache=cache)
+    cache.close()
+    _on_mapper_configured(Note.__mapper__, Note)
+    assert len(cache) == 1
+
+
+def test_caches_are_garbage_collected():
+    caches = [ConversionCache() for _ in range(3)]
+    references = [weakref.ref(cache) for cache in caches]
+    del caches
+    gc.collect()
+    assert all(reference() is None for reference in references)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+import pytest
+import sqlalchemy as sa
+from flask_restplus import fields, marshal
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
+
+from flask_restplus_sqlalchemy import SQLAlchemyModelConverter, SQLAlchemyToRestPlus
+from flask_restplus_sqlalchemy.convert import VersionedDict
+
+Base = declarative_base()
+
+
+class Amount(TypeDecorator):
+    impl = sa.Numeric
+
+
+class Price(Base):
+    __tablename__ = "convert_price"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    exact = sa.Column(sa.Numeric(10, 2))
+    approximate = sa.Column(sa.Numeric(10, 2, asdecimal=False))
+    ratio = sa.Column(sa.Float())
+    decimal_ratio = sa.Column(sa.Float(asdecimal=True))
+    amount = sa.Column(Amount(asdecimal=False))
+    name = sa.Column(sa.String(20))
+
+
+@pytest.fixture
+def converter():
+    SQLAlchemyModelConverter.clear_type_cache()
+    yield SQLAlchemyModelConverter()
+    SQLAlchemyModelConverter.clear_type_cache()
+
+
+@pytest.mark.parametrize("order", [1, -1], ids=["declared", "reversed"])
+def test_asdecimal_resolves_per_column(converter, order):
+    columns = ["exact", "approximate", "ratio", "decimal_ratio", "amount"][::order]
+    resolved = {
+        name: converter._get_field_class_for_data_type(Price.__table__.c[name].type)
+        for name in columns
+    }
+    assert resolved == {
+        "exact": fields.Arbitrary,
+        "approximate": fields.Float,
+        "ratio": fields.Float,
+        "decimal_ratio": fields.Arbitrary,
+        "amount": fields.Float,
+    }
+
+
+def test_asdecimal_on_one_model(converter):
+    model = SQLAlchemyToRestPlus("PriceModel", {}, model=Price, cache=False)
+    assert type(model["exact"]) is fields.Arbitrary
+    assert type(model["approximate"]) is fields.Float
+    assert type(model["decimal_ratio"]) is fields.Arbitrary
+    assert type(model["amount"]) is fields.Float
+
+
+def test_resolution_is_cached(converter):
+    column_type = Price.__table__.c.name.type
+    converter._get_field_class_for_data_type(column_type)
+    cache = SQLAlchemyModelConverter._type_resolution_cache
+    misses = cache.misses
+    assert converter._get_field_class_for_data_type(sa.String(50)) is fields.String
+    assert cache.misses == misses
+
+
+def test_mapping_change_clears_cache(converter):
+    class Converter(SQLAlchemyModelConverter):
+        PYTHON_TYPE_MAPPING = VersionedDict(SQLAlchemyModelConverter.PYTHON_TYPE_MAPPING)
+
+    converter = Converter()
+    assert converter._get_field_class_for_data_type(sa.String()) is fields.String
+    Converter.PYTHON_TYPE_MAPPING[str] = fields.Raw
+    assert converter._get_field_class_for_data_type(sa.String()) is fields.Raw
+
+
+NestedBase = declarative_base()
+
+
+class Group(NestedBase):
+    __tablename__ = "convert_group"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    users = relationship("User", back_populates="group")
+
+
+class User(NestedBase):
+    __tablename__ = "convert_user"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    group_id = sa.Column(sa.Integer, sa.ForeignKey("convert_group.id"))
+    group = relationship("Group", back_populates="users")
+    manager_id = sa.Column(sa.Integer, sa.ForeignKey("convert_user.id"))
+    manager = relationship("User", remote_side=[id])
+
+
+class Project(NestedBase):
+    __tablename__ = "convert_project"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    group_id = sa.Column(sa.Integer, sa.ForeignKey("convert_group.id"))
+    group = relationship("Group")
+
+
+@pytest.fixture
+def shared_models():
+    SQLAlchemyModelConverter.clear_shared_models()
+    yield
+    SQLAlchemyModelConverter.clear_shared_models()
+
+
+def _nested(model, key):
+    return model[key].nested
+
+
+@pytest.mark.parametrize("first", [None, Project, Group], ids=["alone", "after_project", "after_group"])
+def test_back_references_at_depth_two(shared_models, first):
+    if first is not None:
+        SQLAlchemyToRestPlus(first.__name__ + "FirstModel", {}, model=first, nested_depth=2, cache=False)
+    model = SQLAlchemyToRestPlus("UserDepthModel", {}, model=User, nested_depth=2, cache=False)
+
+    group = _nested(model, "group")
+    assert group.name == "GroupNested1Model"
+    # back to the user the group is nested in
+    assert _nested(group, "users").name == "UserRefModel"
+    assert set(_nested(group, "users")) == {"id"}
+    # a class to itself
+    assert _nested(model, "manager").name == "UserRefModel"
+
+
+def test_back_references_from_the_other_side(shared_models):
+    model = SQLAlchemyToRestPlus("GroupDepthModel", {}, model=Group, nested_depth=2, cache=False)
+    users = _nested(model, "users")
+    assert users.name == "UserNested1Model"
+    assert _nested(users, "group").name == "GroupRefModel"
+    # not a back reference, expanded until depth runs out
+    assert _nested(users, "manager").name == "UserRefModel"
+
+
+def test_shared_models_depend_on_class_and_depth(shared_models):
+    user_model = SQLAlchemyToRestPlus("UserSharedModel", {}, model=User, nested_depth=2, cache=False)
+    project_model = SQLAlchemyToRestPlus("ProjectSharedModel", {}, model=Project, nested_depth=2, cache=False)
+    assert _nested(project_model, "group") is _nested(user_model, "group")
+
+
+def test_round_trip_marshal(shared_models):
+    model = SQLAlchemyToRestPlus("UserRoundTripModel", {}, model=User, nested_depth=2, cache=False)
+    group = Group(id=1, name="staff")
+    alice = User(id=1, name="alice", group=group)
+    bob = User(id=2, name="bob", group=group, manager=alice)
+    assert marshal(bob, model) == {
+        "id": 2,
+        "name": "bob",
+        "group_id": None,
+        "manager_id": None,
+        "group": {"id": 1, "name": "staff", "users": [{"id": 1}, {"id": 2}]},
+        "manager": {"id": 1},
+    }
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import pytest
+import sqlalchemy as sa
+from flask_restplus import marshal
+from sqlalchemy.ext.declarative import declarative_base
+
+from flask_restplus_sqlalchemy import SQLAlchemyToRestPlus, get_row_marshaller, select_for_model
+
+Base = declarative_base()
+
+
+class Flag(Base):
+    __tablename__ = "core_flag"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(50))
+    active = sa.Column(sa.Boolean)
+    score = sa.Column(sa.Float)
+
+
+FlagModel = SQLAlchemyToRestPlus("CoreFlagModel", {}, model=Flag)
+
+KEYS = ("id", "name", "active", "score")
+BOOLEANS = [True, False, 1, 0, "true", "false", "True", "0", "1", "on", "", None, "yes", "off", 2]
+STRINGS = ["text", "", 5, None, True]
+ROWS = [(1, name, active, None) for active in BOOLEANS for name in STRINGS]
+
+
+def _outcome(function, *args):
+    try:
+        return ("ok", function(*args))
+    except Exception as error:
+        return ("error", type(error))
+
+
+@pytest.fixture
+def connection():
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.mark.parametrize("row", ROWS, ids=repr)
+def test_row_marshaller_matches_marshal(row):
+    expected = _outcome(marshal, dict(zip(KEYS, row)), FlagModel)
+    assert _outcome(get_row_marshaller(FlagModel, KEYS), row) == expected
+
+
+def test_row_marshaller_missing_columns():
+    row = (1, "false")
+    assert get_row_marshaller(FlagModel, ("id", "active"))(row) == marshal({"id": 1, "active": "false"}, FlagModel)
+
+
+def test_row_marshaller_rows(connection):
+    connection.execute(Flag.__table__.insert(), [
+        {"id": 1, "name": "a", "active": True, "score": 1.5},
+        {"id": 2, "name": None, "active": False, "score": None},
+        {"id": 3, "name": "c", "active": None, "score": 2},
+    ])
+    rows = connection.execute(select_for_model(FlagModel).order_by(Flag.id)).fetchall()
+    expected = marshal([dict(zip(KEYS, row)) for row in rows], FlagModel)
+    assert get_row_marshaller(FlagModel)(list(rows)) == expected
+    assert expected[1] == {"id": 2, "name": None, "active": False, "score": None}
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import gc
+import weakref
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from flask_restplus_sqlalchemy import ModelIndex, SQLAlchemyModelConverter, SQLAlchemyToRestPlus
+from flask_restplus_sqlalchemy.dependencies import get_model_dependencies
+
+
+def _declare():
+    base = declarative_base()
+
+    class Group(base):
+        __tablename__ = "dependencies_group"
+
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    class Badge(base):
+        __tablename__ = "dependencies_badge"
+
+        id = sa.Column(sa.Integer, primary_key=True)
+        user_id = sa.Column(sa.Integer, sa.ForeignKey("dependencies_user.id"))
+
+    class User(base):
+        __tablename__ = "dependencies_user"
+
+        id = sa.Column(sa.Integer, primary_key=True)
+        group_id = sa.Column(sa.Integer, sa.ForeignKey("dependencies_group.id"))
+        group = relationship(Group)
+        badges = relationship(Badge)
+
+    sa.orm.configure_mappers()
+    return (Group, Badge, User)
+
+
+def _add_column(class_, name):
+    class_.__table__.append_column(sa.Column(name, sa.String(10)))
+    class_.__mapper__.add_property(name, class_.__table__.c[name])
+
+
+@pytest.fixture
+def index():
+    SQLAlchemyModelConverter.clear_shared_models()
+    index = ModelIndex(listen=False)
+    SQLAlchemyToRestPlus.model_index = index
+    yield index
+    SQLAlchemyToRestPlus.model_index = None
+    index.close()
+    SQLAlchemyModelConverter.clear_shared_models()
+
+
+def test_dependencies(index):
+    (Group, Badge, User) = _declare()
+    model = SQLAlchemyToRestPlus("UserModel", {}, model=User, nested_depth=1, cache=False)
+    assert get_model_dependencies(model) == {User, Group, Badge}
+    assert index.get_models(Badge) == [model]
+
+
+def test_regenerates_affected_models(index, api):
+    (Group, Badge, User) = _declare()
+    user_model = SQLAlchemyToRestPlus("UserModel", {}, model=User, nested_depth=1, cache=False)
+    index.register(api, user_model)
+    group_model = SQLAlchemyToRestPlus("GroupModel", {}, model=Group, cache=False)
+    group_nested = user_model["group"].model
+    badge_nested = user_model["badges"].model
+
+    _add_column(Badge, "label")
+    assert index.refresh() == [user_model]
+
+    # regenerated in place, the nested model of the changed class converted again
+    assert api.models["UserModel"] is user_model
+    assert "label" in user_model["badges"].model
+    assert user_model["badges"].model is not badge_nested
+    assert api.models["BadgeNested0Model"] is user_model["badges"].model
+    # the nested models of other classes are kept
+    assert user_model["group"].model is group_nested
+    assert "label" not in group_model
+
+
+def test_regenerate_keeps_unrelated_shared_models(index):
+    (Group, Badge, User) = _declare()
+    user_model = SQLAlchemyToRestPlus("UserModel", {}, model=User, nested_depth=1, cache=False)
+    badge_model = SQLAlchemyToRestPlus("BadgeModel", {}, model=Badge, nested_depth=1, cache=False)
+    group_nested = user_model["group"].model
+
+    index.regenerate(badge_model)
+    assert user_model["group"].model is group_nested
+    assert SQLAlchemyToRestPlus("OtherUserModel", {}, model=User, nested_depth=1, cache=False)["group"].model \
+        is group_nested
+
+
+def test_close_stops_tracking_changes(index):
+    (Group, Badge, User) = _declare()
+    model = SQLAlchemyToRestPlus("GroupModel", {}, model=Group, cache=False)
+    index.close()
+    _add_column(Group, "label")
+    assert index.refresh() == []
+    assert "label" not in model
+
+
+def test_indexes_are_garbage_collected():
+    (Group, Badge, User) = _declare()
+    index = ModelIndex()
+    model = SQLAlchemyToRestPlus("GroupModel", {}, model=Group, cache=False)
+    index.track(model)
+    reference = weakref.ref(index)
+    del index
+    gc.collect()
+    assert reference() is None
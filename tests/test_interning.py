@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+import sqlalchemy as sa
+from flask_restplus import Model, fields
+from sqlalchemy.ext.declarative import declarative_base
+
+from flask_restplus_sqlalchemy import FieldInterner, ModelRegistry, SQLAlchemyModelConverter, SQLAlchemyToRestPlus
+from flask_restplus_sqlalchemy.cache import freeze
+
+Base = declarative_base()
+
+
+class Account(Base):
+    __tablename__ = "interning_account"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20), nullable=False)
+    email = sa.Column(sa.String(50))
+
+
+def test_freeze_compares_by_content():
+    assert freeze({"a": [1, 2], "b": fields.String(max_length=2)}) == freeze({"b": fields.String(max_length=2), "a": [1, 2]})
+    assert freeze([1, 2]) != freeze([2, 1])
+    assert freeze([1, 2]) != freeze((1, 2))
+    assert freeze({1, 2}) == freeze({2, 1})
+    assert freeze(fields.String(max_length=2)) != freeze(fields.String(max_length=3))
+    assert freeze(fields.String()) != freeze(fields.Raw())
+
+
+def test_freeze_compares_models_by_identity():
+    assert freeze(Model("Same", {})) != freeze(Model("Same", {}))
+    model = Model("Same", {})
+    assert freeze(fields.Nested(model)) == freeze(fields.Nested(model))
+
+
+def test_shares_identical_fields():
+    interner = FieldInterner()
+    first = interner.get(fields.String, {"max_length": 20, "required": True})
+    assert interner.get(fields.String, {"required": True, "max_length": 20}) is first
+    assert interner.get(fields.String, {"max_length": 21, "required": True}) is not first
+    assert interner.get(fields.List, {"cls_or_instance": fields.String()}) is interner.get(
+        fields.List, {"cls_or_instance": fields.String()}
+    )
+    assert interner.get(fields.Nested, {"model": Model("Placeholder", {})}) is not interner.get(
+        fields.Nested, {"model": Model("Placeholder", {})}
+    )
+    assert interner.stats()["hits"] == 2
+
+
+def test_enum_order_is_kept():
+    interner = FieldInterner()
+    first = interner.get(fields.String, {"enum": ["a", "b"]})
+    assert interner.get(fields.String, {"enum": ["b", "a"]}) is not first
+
+
+def test_evicts_least_recently_used():
+    interner = FieldInterner(maxsize=2)
+    first = interner.get(fields.String, {"max_length": 1})
+    interner.get(fields.String, {"max_length": 2})
+    assert interner.get(fields.String, {"max_length": 1}) is first
+    interner.get(fields.String, {"max_length": 3})
+    assert len(interner) == 2
+    assert interner.get(fields.String, {"max_length": 1}) is first
+    with pytest.raises(ValueError):
+        FieldInterner(maxsize=0)
+
+
+def test_counts_under_concurrency():
+    interner = FieldInterner(maxsize=8)
+
+    def work():
+        for index in range(500):
+            interner.get(fields.String, {"max_length": index % 16})
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = interner.stats()
+    assert stats["requests"] == 4000
+    assert stats["fields"] <= 8
+
+
+def test_converter_uses_interner():
+    interner = FieldInterner()
+    SQLAlchemyModelConverter.interner = interner
+    try:
+        first = SQLAlchemyToRestPlus("AccountModel", {}, model=Account, cache=False)
+        second = SQLAlchemyToRestPlus("AccountNameModel", {}, model=Account, only=["name"], cache=False)
+    finally:
+        SQLAlchemyModelConverter.interner = None
+    assert second["name"] is first["name"]
+    assert interner.stats()["hits"] >= 1
+
+
+def test_registry_compares_fields_by_content():
+    registry = ModelRegistry()
+    first = registry.get("AccountExtraModel", {"nick": fields.String(max_length=5)}, model=Account, only=["id", "name"])
+    second = registry.get("AccountExtraModel", {"nick": fields.String(max_length=5)}, model=Account, only=["name", "id"])
+    assert second is first
+    with pytest.raises(ValueError):
+        registry.get("AccountExtraModel", {"nick": fields.String(max_length=6)}, model=Account, only=["id", "name"])
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from flask_restplus import fields, marshal
+from sqlalchemy.ext.declarative import declarative_base
+
+from flask_restplus_sqlalchemy import SQLAlchemyToRestPlus, get_marshaller
+
+Base = declarative_base()
+
+
+class Flag(Base):
+    __tablename__ = "marshalling_flag"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(50))
+    active = sa.Column(sa.Boolean)
+    score = sa.Column(sa.Float)
+
+
+FlagModel = SQLAlchemyToRestPlus("FlagModel", {}, model=Flag)
+
+BOOLEANS = [True, False, 1, 0, "true", "false", "True", "0", "1", "on", "", None, "yes", "off", 2]
+STRINGS = ["text", "", 5, None, True]
+
+
+def _outcome(function, *args):
+    try:
+        return ("ok", function(*args))
+    except Exception as error:
+        return ("error", type(error))
+
+
+def _objects():
+    for active in BOOLEANS:
+        for name in STRINGS:
+            yield SimpleNamespace(id=1, name=name, active=active, score=None)
+
+
+def test_field_types():
+    assert type(FlagModel["active"]) is fields.Boolean
+    assert type(FlagModel["name"]) is fields.String
+
+
+@pytest.mark.parametrize("obj", list(_objects()), ids=repr)
+def test_marshaller_matches_marshal(obj):
+    assert _outcome(get_marshaller(FlagModel), obj) == _outcome(marshal, obj, FlagModel)
+
+
+def test_marshaller_matches_marshal_for_lists():
+    objects = [obj for obj in _objects() if obj.active != "yes" and obj.active != "off" and obj.active != 2]
+    assert get_marshaller(FlagModel)(objects) == marshal(objects, FlagModel)
+
+
+def test_marshaller_recompiled_after_change():
+    model = SQLAlchemyToRestPlus("FlagChangedModel", {}, model=Flag, only=["id"])
+    obj = SimpleNamespace(id=1, name="a", active="false", score=1)
+    assert get_marshaller(model)(obj) == {"id": 1}
+    model["active"] = fields.Boolean()
+    assert get_marshaller(model)(obj) == {"id": 1, "active": False}
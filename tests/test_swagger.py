@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+
+import sqlalchemy as sa
+from flask_restplus import Resource
+from sqlalchemy.ext.declarative import declarative_base
+
+from flask_restplus_sqlalchemy import SQLAlchemyToRestPlus, SwaggerCache
+
+Base = declarative_base()
+
+
+class Book(Base):
+    __tablename__ = "swagger_book"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    title = sa.Column(sa.String(50), nullable=False)
+    pages = sa.Column(sa.Integer)
+
+
+def _install(app, api):
+    model = api.add_model("BookModel", SQLAlchemyToRestPlus("BookModel", {}, model=Book, only=["id"]))
+
+    @api.route("/books")
+    class Books(Resource):
+        @api.marshal_with(model)
+        def get(self):
+            return []
+
+    cache = SwaggerCache(api)
+    cache.install(app)
+    return (model, cache)
+
+
+def _get_document(client, **headers):
+    response = client.get("/swagger.json", headers=headers)
+    body = response.data
+    if response.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return (response, json.loads(body.decode("utf-8")) if body else None)
+
+
+def test_serves_document_with_etag(app, api):
+    _install(app, api)
+    client = app.test_client()
+
+    (response, document) = _get_document(client)
+    assert response.status_code == 200
+    assert "BookModel" in document["definitions"]
+
+    (cached, _) = _get_document(client, **{"If-None-Match": response.headers["ETag"].strip('"')})
+    assert cached.status_code == 304
+
+
+def test_serves_gzip_variant(app, api):
+    _install(app, api)
+    client = app.test_client()
+
+    (plain, plain_document) = _get_document(client)
+    (gzipped, gzipped_document) = _get_document(client, **{"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] != plain.headers["ETag"]
+    assert gzipped_document == plain_document
+
+
+def test_rebuilds_after_model_change(app, api):
+    (model, _) = _install(app, api)
+    client = app.test_client()
+
+    (before, document) = _get_document(client)
+    assert set(document["definitions"]["BookModel"]["properties"]) == {"id"}
+
+    model.update(SQLAlchemyToRestPlus("BookFullModel", {}, model=Book))
+    (after, document) = _get_document(client)
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert set(document["definitions"]["BookModel"]["properties"]) == {"id", "title", "pages"}
+    # the Api serves the rebuilt schema too
+    with app.test_request_context():
+        assert "pages" in api.__schema__["definitions"]["BookModel"]["properties"]
+
+
+def test_rebuilds_after_new_resource(app, api):
+    _install(app, api)
+    client = app.test_client()
+
+    _get_document(client)
+    other = api.add_model("OtherModel", SQLAlchemyToRestPlus("OtherModel", {}, model=Book, only=["title"]))
+
+    @api.route("/titles")
+    class Titles(Resource):
+        @api.marshal_with(other)
+        def get(self):
+            return []
+
+    (_, document) = _get_document(client)
+    assert "/titles" in document["paths"]
+    assert "OtherModel" in document["definitions"]
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import pytest
+import sqlalchemy as sa
+from flask_restplus import Model, Resource, fields
+from jsonschema import FormatChecker
+from sqlalchemy.ext.declarative import declarative_base
+from werkzeug.exceptions import HTTPException
+
+from flask_restplus_sqlalchemy import SQLAlchemyToRestPlus, get_validator
+from flask_restplus_sqlalchemy.validation import KEYWORDS, UnsupportedSchema
+
+Base = declarative_base()
+
+
+class Group(Base):
+    __tablename__ = "validation_group"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+
+
+class StrictModel(SQLAlchemyToRestPlus):
+    @property
+    def _schema(self):
+        schema = dict(super()._schema)
+        schema["additionalProperties"] = False
+        return schema
+
+
+VALUES = [
+    None, True, False, 0, 1, -1, 1.5, 10, 11, "", "a", "abc", "ABC", "abcdefg", "b",
+    "2020-01-01", "2020-01-01T00:00:00+00:00", "not-a-date",
+    [], ["a"], ["a", "a"], ["a", "b", "c", "d"], [1, True], [0, False], [{"id": 1}], [{}], [{"id": "q"}],
+    {}, {"id": 1}, {"id": "q"}, {"id": 1, "name": 5}, {"name": "x"},
+]
+
+
+def _payload_fields(group_model):
+    return {
+        "id": fields.Integer(required=True, min=0, max=10, exclusiveMin=True),
+        "ratio": fields.Float(min=0.5, max=2, exclusiveMax=True),
+        "name": fields.String(min_length=2, max_length=5, pattern="^[a-z]+$"),
+        "kind": fields.String(enum=["a", "b"]),
+        "flag": fields.Boolean(),
+        "created": fields.DateTime(),
+        "day": fields.Date(),
+        "tags": fields.List(fields.String, min_items=1, max_items=3, unique=True),
+        "values": fields.List(fields.Raw, unique=True),
+        "group": fields.Nested(group_model),
+        "described_group": fields.Nested(group_model, description="with allOf"),
+        "groups": fields.List(fields.Nested(group_model)),
+        "raw": fields.Raw(),
+    }
+
+
+@pytest.fixture
+def models(app, api):
+    group_model = api.add_model("ValidationGroupModel", SQLAlchemyToRestPlus("ValidationGroupModel", {}, model=Group))
+    payload_model = api.add_model("PayloadModel", SQLAlchemyToRestPlus("PayloadModel", _payload_fields(group_model)))
+    strict_model = api.add_model("StrictPayloadModel", StrictModel("StrictPayloadModel", {
+        "id": fields.Integer(required=True),
+        "group": fields.Nested(group_model),
+    }))
+
+    @api.route("/payloads")
+    class Payloads(Resource):
+        @api.expect(payload_model)
+        def post(self):
+            pass
+
+        @api.expect(strict_model)
+        def put(self):
+            pass
+
+    with app.test_request_context():
+        yield (payload_model, strict_model)
+
+
+def _jsonschema_errors(model, data, resolver, format_checker):
+    try:
+        Model.validate(model, data, resolver=resolver, format_checker=format_checker)
+    except HTTPException as error:
+        return error.data["errors"]
+    return {}
+
+
+def _payloads():
+    base = {"id": 5}
+    yield base
+    yield {}
+    yield []
+    yield {"extra": 1}
+    for key in sorted(_payload_fields(Model("Placeholder", {}))):
+        for value in VALUES:
+            yield dict(base, **{key: value})
+
+
+def test_schema_uses_every_keyword(models):
+    (payload_model, strict_model) = models
+    used = set()
+
+    def collect(schema):
+        if isinstance(schema, dict):
+            used.update(schema)
+            for value in schema.values():
+                collect(value)
+        elif isinstance(schema, list):
+            for value in schema:
+                collect(value)
+    collect(payload_model.__schema__)
+    collect(strict_model.__schema__)
+    assert set(KEYWORDS) | {"$ref", "required", "properties", "additionalProperties"} <= used
+
+
+@pytest.mark.parametrize("data", list(_payloads()), ids=repr)
+@pytest.mark.parametrize("format_checker", [None, FormatChecker()], ids=["no_formats", "formats"])
+def test_compiled_validator_matches_jsonschema(models, api, data, format_checker):
+    for model in models:
+        resolver = api.refresolver
+        errors = get_validator(model)(data, format_checker, resolver)
+        assert errors == _jsonschema_errors(model, data, resolver, format_checker)
+
+
+@pytest.mark.parametrize("data", [{"id": 1, "group": {}}, {"id": 1, "group": {"id": "q"}}], ids=repr)
+def test_unregistered_nested_model_falls_back(app, api, data):
+    # nested with a placeholder, the Api resolves the $ref to the registered model
+    api.add_model("FallbackGroupModel", SQLAlchemyToRestPlus("FallbackGroupModel", {}, model=Group))
+    model = api.add_model("FallbackModel", SQLAlchemyToRestPlus("FallbackModel", {
+        "id": fields.Integer(required=True),
+        "group": fields.Nested(Model("FallbackGroupModel", {})),
+    }))
+
+    @api.route("/fallback")
+    class Fallback(Resource):
+        @api.expect(model)
+        def post(self):
+            pass
+
+    with app.test_request_context():
+        resolver = api.refresolver
+        with pytest.raises(UnsupportedSchema):
+            get_validator(model)(data, None, resolver)
+
+        expected = _jsonschema_errors(model, data, resolver, None)
+        assert expected
+        model.compile_validators = True
+        with pytest.raises(HTTPException) as error:
+            model.validate(data, resolver=resolver)
+        assert error.value.data["errors"] == expected
+
+
+def test_nested_ref_needs_resolver(models):
+    (payload_model, _) = models
+    with pytest.raises(UnsupportedSchema):
+        get_validator(payload_model)({"id": 1, "group": {"id": 1}})
+    assert get_validator(payload_model)({"id": 1}) == {}
+
+
+def test_validate_through_api(app, api):
+    SQLAlchemyToRestPlus.compile_validators = True
+    try:
+        group_model = api.add_model("ApiGroupModel", SQLAlchemyToRestPlus("ApiGroupModel", {}, model=Group))
+        model = api.add_model("ApiPayloadModel", SQLAlchemyToRestPlus("ApiPayloadModel", {
+            "id": fields.Integer(required=True),
+            "group": fields.Nested(group_model),
+        }))
+
+        @api.route("/validated")
+        class Validated(Resource):
+            @api.expect(model, validate=True)
+            def post(self):
+                return {}
+
+        client = app.test_client()
+        assert client.post("/validated", json={"id": 1, "group": {"id": 2}}).status_code == 200
+        response = client.post("/validated", json={"id": 1, "group": {"id": "q"}})
+        assert response.status_code == 400
+        assert response.get_json()["errors"] == {"group.id": "'q' is not of type 'integer'"}
+        assert client.post("/validated", json={"group": {}}).get_json()["errors"] == {
+            "group.id": "'id' is a required property",
+            "id": "'id' is a required property",
+        }
+    finally:
+        SQLAlchemyToRestPlus.compile_validators = False
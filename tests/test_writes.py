@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import column_property
+
+from flask_restplus_sqlalchemy import SQLAlchemyToRestPlus, bulk_insert, bulk_update
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "writes_item"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(20))
+    quantity = sa.Column(sa.Integer)
+    double = column_property(quantity * 2)
+
+
+class Tag(Base):
+    __tablename__ = "writes_tag"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    item_id = sa.Column(sa.Integer, sa.ForeignKey("writes_item.id"))
+
+
+Item.tag_count = column_property(
+    sa.select([sa.func.count(Tag.id)]).where(Tag.item_id == Item.id).correlate_except(Tag).as_scalar()
+)
+
+ItemModel = SQLAlchemyToRestPlus("WritesItemModel", {}, model=Item)
+
+
+@pytest.fixture
+def connection():
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+
+
+def _rows(connection):
+    return [tuple(row) for row in connection.execute(sa.select([Item.__table__]).order_by(Item.id))]
+
+
+def test_model_has_expression_fields():
+    assert {"double", "tag_count"} <= set(ItemModel)
+
+
+def test_bulk_insert_skips_expressions(connection):
+    payloads = [
+        {"id": 1, "name": "a", "quantity": 1, "double": 2, "tag_count": 0},
+        {"id": 2, "name": "b"},
+        {"id": 3, "quantity": 3},
+    ]
+    assert bulk_insert(connection, ItemModel, payloads, batch_size=2) == 3
+    assert _rows(connection) == [(1, "a", 1), (2, "b", None), (3, None, 3)]
+
+
+def test_bulk_update_skips_expressions(connection):
+    bulk_insert(connection, ItemModel, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    payloads = [{"id": 1, "quantity": 5, "double": 10}, {"id": 2, "name": "c", "tag_count": 1}, {"id": 1}]
+    assert bulk_update(connection, ItemModel, payloads) == 3
+    assert _rows(connection) == [(1, "a", 5), (2, "c", None)]
+
+
+def test_bulk_update_needs_primary_key(connection):
+    with pytest.raises(ValueError):
+        bulk_update(connection, ItemModel, [{"name": "a"}])
+    model = SQLAlchemyToRestPlus("WritesNameModel", {}, model=Item, only=["name"])
+    with pytest.raises(ValueError):
+        bulk_update(connection, model, [{"name": "a"}])
+
+
+def test_batch_size_must_be_positive(connection):
+    with pytest.raises(ValueError):
+        bulk_insert(connection, ItemModel, [{"id": 1}], batch_size=0)
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+import numbers
+import re
+import weakref
+
+from flask_restplus import fields
+from jsonschema import FormatError, RefResolutionError
+
+
+class UnsupportedSchema(Exception):
+    '''
+    Raised when a schema uses something the compiled validators don't implement,
+    the payload must then be validated with jsonschema
+    '''
+    pass
+
+
+# keywords without effect on validation
+ANNOTATIONS = {"title", "description", "default", "example", "readOnly", "discriminator"}
+
+# draft 4 types
+TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, numbers.Number) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+_TRUE = object()
+_FALSE = object()
+
+
+def _unbool(value):
+    # jsonschema compares booleans apart from 0 and 1
+    if value is True:
+        return _TRUE
+    if value is False:
+        return _FALSE
+    return value
+
+
+def _is_unique(items) -> bool:
+    seen = []
+    for item in items:
+        item = _unbool(item)
+        if any(item == other for other in seen):
+            return False
+        seen.append(item)
+    return True
+
+
+def _make_field(value):
+    if isinstance(value, type) and issubclass(value, fields.Raw):
+        return value()
+    return value
+
+
+def _get_refs(field) -> dict:
+    '''
+    returns the $ref -> model mapping of the models nested in a field
+    '''
+    refs = {}
+    while field is not None:
+        if isinstance(field, fields.Nested):
+            refs["#/definitions/" + field.nested.name] = field.nested
+        field = getattr(field, "container", None)
+    return refs
+
+
+def _resolve_ref(model, ref, resolver, matches):
+    '''
+    returns the nested model of a $ref if it is the model jsonschema resolves the $ref to,
+    raises UnsupportedSchema otherwise (no resolver, a placeholder or a model not registered by that name)
+    :param matches: resolver -> (fields version of model, whether the schemas matched)
+    '''
+    if resolver is None:
+        raise UnsupportedSchema(ref)
+    version = getattr(model, "_fields_version", None)
+    match = matches.get(resolver)
+    if match is None or match[0] != version or version is None:
+        try:
+            target = resolver.resolve(ref)[1]
+        except RefResolutionError:
+            target = None
+        match = matches[resolver] = (version, target == model.__schema__)
+    if not match[1]:
+        raise UnsupportedSchema(ref)
+    return model
+
+
+def _type(types, schema, refs):
+    types = types if isinstance(types, list) else [types]
+    if any(type_name not in TYPE_CHECKS for type_name in types):
+        raise UnsupportedSchema(types)
+    checks = [TYPE_CHECKS[type_name] for type_name in types]
+    message = "{!r} is not of type " + ", ".join(repr(type_name) for type_name in types)
+
+    def check(value, path, errors, format_checker, resolver):
+        if not any(type_check(value) for type_check in checks):
+            errors.append((path, message.format(value)))
+    return check
+
+
+def _format(format_name, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if format_checker is not None:
+            try:
+                format_checker.check(value, format_name)
+            except FormatError as error:
+                errors.append((path, error.message))
+    return check
+
+
+def _max_length(length, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, str) and len(value) > length:
+            errors.append((path, "{!r} is too long".format(value)))
+    return check
+
+
+def _min_length(length, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, str) and len(value) < length:
+            errors.append((path, "{!r} is too short".format(value)))
+    return check
+
+
+def _pattern(pattern, schema, refs):
+    compiled = re.compile(pattern)
+
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, str) and not compiled.search(value):
+            errors.append((path, "{!r} does not match {!r}".format(value, pattern)))
+    return check
+
+
+def _enum(enums, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if value == 0 or value == 1:
+            unbooled = _unbool(value)
+            valid = any(unbooled == _unbool(each) for each in enums)
+        else:
+            valid = value in enums
+        if not valid:
+            errors.append((path, "{!r} is not one of {!r}".format(value, enums)))
+    return check
+
+
+def _items(items, schema, refs):
+    if not isinstance(items, dict):
+        raise UnsupportedSchema(items)
+    checks = _compile_schema(items, refs)
+
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, list):
+            for (index, item) in enumerate(value):
+                for item_check in checks:
+                    item_check(item, path + (index,), errors, format_checker, resolver)
+    return check
+
+
+def _max_items(count, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, list) and len(value) > count:
+            errors.append((path, "{!r} is too long".format(value)))
+    return check
+
+
+def _min_items(count, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, list) and len(value) < count:
+            errors.append((path, "{!r} is too short".format(value)))
+    return check
+
+
+def _unique_items(unique, schema, refs):
+    def check(value, path, errors, format_checker, resolver):
+        if unique and isinstance(value, list) and not _is_unique(value):
+            errors.append((path, "{!r} has non-unique elements".format(value)))
+    return check
+
+
+def _minimum(minimum, schema, refs):
+    exclusive = schema.get("exclusiveMinimum", False)
+    comparison = "less than or equal to" if exclusive else "less than"
+
+    def check(value, path, errors, format_checker, resolver):
+        if TYPE_CHECKS["number"](value) and (value <= minimum if exclusive else value < minimum):
+            errors.append((path, "{!r} is {} the minimum of {!r}".format(value, comparison, minimum)))
+    return check
+
+
+def _maximum(maximum, schema, refs):
+    exclusive = schema.get("exclusiveMaximum", False)
+    comparison = "greater than or equal to" if exclusive else "greater than"
+
+    def check(value, path, errors, format_checker, resolver):
+        if TYPE_CHECKS["number"](value) and (value >= maximum if exclusive else value > maximum):
+            errors.append((path, "{!r} is {} the maximum of {!r}".format(value, comparison, maximum)))
+    return check
+
+
+def _exclusive(value, schema, refs):
+    # handled by minimum / maximum
+    return None
+
+
+def _all_of(schemas, schema, refs):
+    checks = [check for subschema in schemas for check in _compile_schema(subschema, refs)]
+
+    def check(value, path, errors, format_checker, resolver):
+        for subschema_check in checks:
+            subschema_check(value, path, errors, format_checker, resolver)
+    return check
+
+
+# draft 4 keyword -> factory(argument, schema, refs) of a check(value, path, errors, format_checker, resolver)
+KEYWORDS = {
+    "type": _type,
+    "format": _format,
+    "maxLength": _max_length,
+    "minLength": _min_length,
+    "pattern": _pattern,
+    "enum": _enum,
+    "items": _items,
+    "maxItems": _max_items,
+    "minItems": _min_items,
+    "uniqueItems": _unique_items,
+    "minimum": _minimum,
+    "maximum": _maximum,
+    "exclusiveMinimum": _exclusive,
+    "exclusiveMaximum": _exclusive,
+    "allOf": _all_of,
+}
+
+
+def _compile_schema(schema: dict, refs: dict) -> list:
+    '''
+    compiles a field schema into a list of checks, in keyword order like jsonschema
+    '''
+    if "$ref" in schema:
+        # draft 4 ignores the other keywords next to $ref
+        ref = schema["$ref"]
+        model = refs.get(ref)
+        if model is None:
+            raise UnsupportedSchema(ref)
+        matches = weakref.WeakKeyDictionary()
+
+        def check_ref(value, path, errors, format_checker, resolver):
+            validator = get_validator(_resolve_ref(model, ref, resolver, matches))
+            if validator is None:
+                raise UnsupportedSchema(ref)
+            validator.check(value, path, errors, format_checker, resolver)
+        return [check_ref]
+
+    checks = []
+    for (keyword, argument) in schema.items():
+        if keyword in ANNOTATIONS or keyword.startswith("x-"):
+            continue
+        if keyword not in KEYWORDS:
+            raise UnsupportedSchema(keyword)
+        check = KEYWORDS[keyword](argument, schema, refs)
+        if check is not None:
+            checks.append(check)
+    return checks
+
+
+class CompiledValidator():
+    '''
+    Validates payloads against the schema of a model like jsonschema does,
+    with the checks compiled once from the model fields.
+    '''
+    def __init__(self, checks: list):
+        self.checks = checks
+
+    def check(self, value, path: tuple, errors: list, format_checker=None, resolver=None):
+        for check in self.checks:
+            check(value, path, errors, format_checker, resolver)
+
+    def __call__(self, data, format_checker=None, resolver=None) -> dict:
+        '''
+        returns the errors as {path: message} like flask_restplus, empty if data is valid.
+        raises UnsupportedSchema if a nested model can't be compiled, or isn't the model
+        resolver (the RefResolver of the Api) resolves its $ref to.
+        '''
+        errors = []
+        self.check(data, (), errors, format_checker, resolver)
+        return dict((".".join(str(part) for part in path), message) for (path, message) in errors)
+
+
+def compile_validator(model):
+    '''
+    Compiles a validator for the schema of model, or returns None when the schema uses
+    something the compiled validators don't implement (inheritance, unknown keywords).
+    :param model: the restplus model
+    '''
+    if getattr(model, "__parents__", None):
+        return None
+    schema = model.__schema__
+    checks = []
+    try:
+        for (keyword, argument) in schema.items():
+            if keyword in ANNOTATIONS or keyword.startswith("x-"):
+                continue
+            elif keyword == "required":
+                checks.append(_required(argument))
+            elif keyword == "properties":
+                checks.append(_properties(argument, model))
+            elif keyword == "additionalProperties" and argument is False:
+                checks.append(_no_additional_properties(schema.get("properties", {})))
+            elif keyword == "type":
+                checks.append(_type(argument, schema, {}))
+            else:
+                return None
+    except UnsupportedSchema:
+        return None
+    return CompiledValidator(checks)
+
+
+def _required(required):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, dict):
+            for name in required:
+                if name not in value:
+                    errors.append((path + (name,), "{!r} is a required property".format(name)))
+    return check
+
+
+def _properties(properties, model):
+    compiled = [
+        (name, _compile_schema(subschema, _get_refs(_make_field(model[name]))))
+        for (name, subschema) in properties.items()
+    ]
+
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, dict):
+            for (name, checks) in compiled:
+                if name in value:
+                    for property_check in checks:
+                        property_check(value[name], path + (name,), errors, format_checker, resolver)
+    return check
+
+
+def _no_additional_properties(properties):
+    def check(value, path, errors, format_checker, resolver):
+        if isinstance(value, dict):
+            extras = sorted(name for name in value if name not in properties)
+            if extras:
+                errors.append((path, "Additional properties are not allowed ({} {} unexpected)".format(
+                    ", ".join(repr(extra) for extra in extras), "was" if len(extras) == 1 else "were"
+                )))
+    return check
+
+
+def get_validator(model):
+    '''
+    Returns the compiled validator of model (None if it can't be compiled),
+    compiling it on first use and again after the fields of the model changed.
+    :param model: the restplus model
+    '''
+    version = getattr(model, "_fields_version", None)
+    cached = model.__dict__.get("_compiled_validator")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    validator = compile_validator(model)
+    model._compiled_validator = (version, validator)
+    return validator
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from itertools import islice
+
+import sqlalchemy as sa
+
+from .core import get_column_map
+
+
+def _get_table_columns(model):
+    # column_property expressions (scalar selects, computed values) aren't writable
+    columns = OrderedDict(
+        (key, column) for (key, column) in get_column_map(model).items() if isinstance(column, sa.Column)
+    )
+    tables = set(column.table for column in columns.values())
+    if len(tables) != 1:
+        raise ValueError(
+            "Bulk writes need the fields of model {} to map to the columns of one table.".format(model.name)
+        )
+    return tables.pop(), columns
+
+
+def _iter_batches(payloads, batch_size: int):
+    if batch_size < 1:
+        raise ValueError("`batch_size` must be positive.")
+    payloads = iter(payloads)
+    batch = list(islice(payloads, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(payloads, batch_size))
+
+
+def bulk_insert(bind, model, payloads, batch_size: int = 1000) -> int:
+    '''
+    Inserts validated payloads of model with executemany Core inserts, without building ORM instances.
+    Only the fields backed by a column are written, payloads are grouped by the fields they contain.
+    :param bind: a Connection or Session
+    :param model: a model generated by SQLAlchemyToRestPlus
+    :param payloads: iterable of payload dicts
+    :param batch_size: payloads per batch
+    :returns: the number of payloads inserted
+    '''
+    table, columns = _get_table_columns(model)
+    statement = table.insert()
+    count = 0
+    for batch in _iter_batches(payloads, batch_size):
+        groups = OrderedDict()
+        for payload in batch:
+            keys = tuple(key for key in columns if key in payload)
+            groups.setdefault(keys, []).append(
+                dict((columns[key].key, payload[key]) for key in keys)
+            )
+        for rows in groups.values():
+            bind.execute(statement, rows)
+        count += len(batch)
+    return count
+
+
+def bulk_update(bind, model, payloads, batch_size: int = 1000) -> int:
+    '''
+    Updates the rows of validated payloads of model by primary key with executemany Core updates.
+    The fields of the primary key are required, the other fields backed by a column are written when present.
+    :param bind: a Connection or Session
+    :param model: a model generated by SQLAlchemyToRestPlus
+    :param payloads: iterable of payload dicts
+    :param batch_size: payloads per batch
+    :returns: the number of payloads processed
+    '''
+    table, columns = _get_table_columns(model)
+    primary_keys = [key for (key, column) in columns.items() if column.primary_key]
+    if len(primary_keys) != len(table.primary_key.columns):
+        raise ValueError(
+            "Bulk updates need the primary key fields of model {}.".format(model.name)
+        )
+    # bind names must not clash with the column names in values()
+    condition = sa.and_(*[
+        columns[key] == sa.bindparam("pk_" + columns[key].key) for key in primary_keys
+    ])
+    statements = {}
+    count = 0
+    for batch in _iter_batches(payloads, batch_size):
+        groups = OrderedDict()
+        for payload in batch:
+            missing = [key for key in primary_keys if key not in payload]
+            if missing:
+                raise ValueError("Payload is missing primary key fields {}.".format(", ".join(missing)))
+            keys = tuple(key for key in columns if key in payload and key not in primary_keys)
+            row = dict(("pk_" + columns[key].key, payload[key]) for key in primary_keys)
+            row.update((columns[key].key, payload[key]) for key in keys)
+            groups.setdefault(keys, []).append(row)
+        for (keys, rows) in groups.items():
+            if not keys:
+                continue
+            statement = statements.get(keys)
+            if statement is None:
+                statement = statements[keys] = table.update().where(condition).values(dict(
+                    (columns[key].key, sa.bindparam(columns[key].key)) for key in keys
+                ))
+            bind.execute(statement, rows)
+        count += len(batch)
+    return count